@@ -1,10 +1,18 @@
 # browser_chrome_tabs_api.py
-import socket, ssl, sys, urllib.parse, tkinter, tkinter.font
+import functools
+import os
+import re
+import socket, ssl, select, sys, urllib.parse, tkinter, tkinter.font
 import threading  # for timers and task scheduling
+import queue  # frame handoff to the raster thread
+import concurrent.futures  # parallel subresource fetches
+from collections import deque
+from bisect import bisect_left, bisect_right
 import ctypes  # needed for Skia/SDL pointer handling
 import time
-import email.utils
 import math
+import zlib  # gzip response bodies
+from datetime import datetime, timezone
 
 # Prefer Skia/SDL if available
 try:
@@ -13,6 +21,21 @@ try:
 except Exception:
     SKIA_OK = False
 
+# Optional Pillow support for the Tk path: when present, frames are
+# rasterized into one PIL image and blitted with a single canvas call
+# instead of thousands of per-item Tcl round-trips.
+try:
+    from PIL import Image as PILImage, ImageDraw as PILImageDraw, \
+        ImageTk as PILImageTk, ImageFont as PILImageFont
+    PIL_OK = True
+except Exception:
+    PIL_OK = False
+# The PIL raster path is opt-in (set BROWSER_PIL_RASTER=1): it trades
+# per-item canvas updates for one full-frame blit, but text goes
+# through PIL's font rendering instead of Tk's, which looks different.
+PIL_RASTER = PIL_OK and \
+    os.environ.get("BROWSER_PIL_RASTER", "") not in ("", "0")
+
 # Tk rendering active? (used by get_font)
 TK_ACTIVE = True
 
@@ -232,6 +255,16 @@ class TaskRunner:
             self.tasks.append(task)
             # Wake up any waiting threads
             self.condition.notify_all()
+        # A queued task needs an animation frame to run on; arm one so
+        # work scheduled from timers, XHR threads, or page loads starts
+        # draining instead of waiting for the user to scroll.
+        try:
+            browser = getattr(self.tab, 'browser', None)
+            if browser is not None and \
+                    hasattr(browser, 'set_needs_animation_frame'):
+                browser.set_needs_animation_frame(self.tab)
+        except Exception:
+            pass
 
     def run(self) -> None:
         """Run the next task from the queue, if there is one."""
@@ -266,7 +299,160 @@ XHR_ONLOAD_JS = "__runXHROnload(dukpy.out, dukpy.handle)"
 # requests via the Cookie header.
 COOKIE_JAR: dict[str, dict[str, tuple[str, dict[str, str]]]] = {}
 
+# Earliest expiration timestamp per origin. The cookie-send path runs
+# once per subresource; when now is still before this, the whole
+# expiry sweep is skipped and cookies go straight into the header.
+NEXT_EXPIRY: dict[str, float] = {}
+
+# Monotonic per-origin jar version, bumped on every store or expiry so
+# derived values (like the document.cookie string) can be cached and
+# looked up instead of rebuilt while the jar is unchanged.
+JAR_VERSION: dict[str, int] = {}
+
+# Assembled document.cookie string per origin as (jar version, string);
+# valid while the version matches and no cookie has hit its deadline.
+_COOKIE_STR_CACHE: dict[str, tuple[int, str]] = {}
+
+# Matches the three Expires date shapes RFC 6265 asks parsers to
+# accept: IMF-fixdate ("Wed, 21 Oct 2015 07:28:00 GMT"), RFC 850
+# ("Wednesday, 21-Oct-15 07:28:00 GMT") and asctime-ish variants.
+_EXPIRES_RE = re.compile(
+    r'(?i)^(?:\w{3,9},?\s*)?(\d{1,2})[-\s](\w{3})[-\s](\d{2,4})'
+    r'\s+(\d{2}):(\d{2}):(\d{2})\s*(?:GMT|UTC)?\s*$')
+_MONTHS = {'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+           'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12}
+
+def _cookie_expiry(params) -> float:
+    """Expiration timestamp for a cookie's params, or +inf if none."""
+    exp = params.get('expires')
+    if exp in (None, ""):
+        return math.inf
+    try:
+        return float(exp)
+    except Exception:
+        pass
+    exp = str(exp)
+    # One regex match plus direct datetime construction instead of the
+    # long Python-level split/try chain inside email.utils.
+    m = _EXPIRES_RE.match(exp)
+    if m:
+        day, mon, year, hh, mm, ss = m.groups()
+        month = _MONTHS.get(mon.lower())
+        if month:
+            year = int(year)
+            if year < 100:
+                year += 1900 if year >= 70 else 2000
+            try:
+                return datetime(year, month, int(day), int(hh), int(mm),
+                                int(ss), tzinfo=timezone.utc).timestamp()
+            except ValueError:
+                return math.inf
+    try:
+        # Fallback for exotic date shapes; deferred so the email
+        # package stays unloaded until one shows up.
+        import email.utils
+        return email.utils.parsedate_to_datetime(exp).timestamp()
+    except Exception:
+        return math.inf
+
+def _store_cookie(origin: str, name: str, val: str, params: dict) -> None:
+    """Store a cookie in the jar, normalizing expires to a float
+    timestamp and samesite to lowercase so the send path never
+    re-parses either, and fold its expiry into NEXT_EXPIRY."""
+    if 'expires' in params:
+        exp_ts = _cookie_expiry(params)
+        if exp_ts != math.inf:
+            params['expires'] = exp_ts
+        if exp_ts < NEXT_EXPIRY.get(origin, math.inf):
+            NEXT_EXPIRY[origin] = exp_ts
+    if 'samesite' in params:
+        params['samesite'] = str(params['samesite']).strip().lower()
+    if 'path' in params:
+        params['path'] = str(params['path']).strip() or '/'
+    COOKIE_JAR.setdefault(origin, {})[name] = (val, params)
+    JAR_VERSION[origin] = JAR_VERSION.get(origin, 0) + 1
+
+def _sweep_expired(origin: str, now: float) -> None:
+    """Drop expired cookies for origin and recompute its next expiry."""
+    jar = COOKIE_JAR.get(origin)
+    if not jar:
+        NEXT_EXPIRY.pop(origin, None)
+        return
+    nxt = math.inf
+    for name in list(jar):
+        exp_ts = _cookie_expiry(jar[name][1])
+        if now > exp_ts:
+            del jar[name]
+            JAR_VERSION[origin] = JAR_VERSION.get(origin, 0) + 1
+        elif exp_ts < nxt:
+            nxt = exp_ts
+    if nxt == math.inf:
+        NEXT_EXPIRY.pop(origin, None)
+    else:
+        NEXT_EXPIRY[origin] = nxt
+
 # ================= Networking =================
+# CONN_POOL holds idle keep-alive connections keyed by
+# (scheme, host, port). Each entry is a (socket, buffered reader) pair:
+# the reader travels with the socket so any bytes it buffered past one
+# response stay attached to the connection. The list is used LIFO so
+# the most recently returned (least likely to have timed out) socket is
+# tried first. For HTTPS the pooled socket is the already-wrapped
+# ssl.SSLSocket, so reuse skips the TLS handshake entirely.
+CONN_POOL: dict[tuple, list] = {}
+_CONN_POOL_LOCK = threading.Lock()
+_CONN_POOL_MAX_IDLE = 6
+
+# One SSLContext shared by every HTTPS request. The context carries the
+# client-side TLS session cache, so repeat handshakes to a host resume
+# instead of redoing certificate verification and key exchange. The
+# per-host sessions saved in _TLS_SESSIONS make resumption work even
+# after the pooled socket itself has been closed. Created on first use:
+# loading the system CA bundle is a measurable chunk of cold start and
+# pure HTTP sessions never need it.
+SSL_CTX = None
+_TLS_SESSIONS: dict[str, "ssl.SSLSession"] = {}
+
+def _ssl_ctx():
+    global SSL_CTX
+    if SSL_CTX is None:
+        SSL_CTX = ssl.create_default_context()
+    return SSL_CTX
+
+def _pool_take(key):
+    """Pop an idle connection for key, discarding any that went stale."""
+    with _CONN_POOL_LOCK:
+        conns = CONN_POOL.get(key)
+        while conns:
+            s, reader = conns.pop()
+            try:
+                # An idle socket that polls readable has either hit EOF
+                # (server closed it) or has unsolicited data buffered;
+                # both make it unusable for a new request.
+                readable, _, _ = select.select([s], [], [], 0)
+            except Exception:
+                readable = [s]
+            if readable:
+                try:
+                    s.close()
+                except Exception:
+                    pass
+                continue
+            return s, reader
+    return None
+
+def _pool_give(key, s, reader):
+    """Return a connection to the pool, closing it if the pool is full."""
+    with _CONN_POOL_LOCK:
+        conns = CONN_POOL.setdefault(key, [])
+        if len(conns) < _CONN_POOL_MAX_IDLE:
+            conns.append((s, reader))
+            return
+    try:
+        s.close()
+    except Exception:
+        pass
+
 class URL:
     def __init__(self, url):
         self.scheme, rest = url.split("://", 1)
@@ -280,8 +466,17 @@ class URL:
             self.port = int(p)
 
     def origin(self) -> str:
-        """Return the origin (scheme + host + port) of this URL."""
-        return f"{self.scheme}://{self.host}:{self.port}"
+        """Return the origin (scheme + host + port) of this URL.
+
+        Cached per instance: origin() is called once per subresource on
+        the load path (CSP checks, cookie scoping), and scheme/host/port
+        never change after __init__.
+        """
+        o = getattr(self, "_origin_cached", None)
+        if o is None:
+            o = f"{self.scheme}://{self.host}:{self.port}"
+            self._origin_cached = o
+        return o
 
     def request(self, referrer: str | None = None, payload: str | None = None, origin: str | None = None):
         """
@@ -290,26 +485,22 @@ class URL:
         optional Referer and Origin headers. Returns a tuple of
         (headers, body).
         """
-        # Connect to server
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
-        s.connect((self.host, self.port))
-        if self.scheme == "https":
-            ctx = ssl.create_default_context()
-            try:
-                s = ctx.wrap_socket(s, server_hostname=self.host)
-            except ssl.SSLError:
-                # Certificate errors will propagate to caller
-                s.close()
-                raise
-        # Build request
+        # Build request as a list of already-encoded header lines; one
+        # b"".join at the end beats growing a str with += and encodes
+        # each piece exactly once.
         method = "POST" if payload is not None else "GET"
-        req = f"{method} {self.path} HTTP/1.0\r\nHost: {self.host}\r\n"
+        parts = [
+            f"{method} {self.path} HTTP/1.1\r\n".encode("utf8"),
+            f"Host: {self.host}\r\n".encode("utf8"),
+            b"Connection: keep-alive\r\n",
+            b"Accept-Encoding: gzip\r\n",
+        ]
         # Referer header
         if referrer:
-            req += f"Referer: {referrer}\r\n"
+            parts.append(f"Referer: {referrer}\r\n".encode("utf8"))
         # Origin header
         if origin:
-            req += f"Origin: {origin}\r\n"
+            parts.append(f"Origin: {origin}\r\n".encode("utf8"))
         # Cookie header
         jar_key = self.origin()
         cookies: list[str] = []
@@ -324,50 +515,88 @@ class URL:
             except Exception:
                 ref_origin = None
         cross_site = ref_origin is not None and ref_origin != jar_key
-        # Iterate through cookies and collect those that should be sent
-        remove_names: list[str] = []
-        for name, (value, params) in jar.items():
-            # Expiration: skip and remove expired cookies
-            exp = params.get('expires')
-            if exp:
-                try:
-                    # If stored as timestamp
-                    expires_ts = float(exp) if not isinstance(exp, (str, bytes)) else float(exp)
-                except Exception:
-                    try:
-                        dt = email.utils.parsedate_to_datetime(str(exp))
-                        expires_ts = dt.timestamp()
-                    except Exception:
-                        expires_ts = None
-                if expires_ts is not None and now > expires_ts:
-                    remove_names.append(name)
+        if jar:
+            # Expiry sweep only when something can actually have
+            # expired; NEXT_EXPIRY tracks the earliest deadline.
+            if now >= NEXT_EXPIRY.get(jar_key, math.inf):
+                _sweep_expired(jar_key, now)
+            # SameSite=Lax: skip on cross-site POST (samesite is
+            # normalized to lowercase at store time)
+            skip_lax = method == 'POST' and cross_site
+            # Path-scope the jar per RFC 6265 section 5.4: only cookies
+            # whose path covers the request path are sent, longest path
+            # first with dict insertion order (== creation order, since
+            # updates keep a key's original slot) breaking ties.
+            req_path = self.path or "/"
+            selected = []
+            for seq, (name, (value, params)) in enumerate(jar.items()):
+                if skip_lax and params.get('samesite') == 'lax':
                     continue
-            # SameSite=Lax: skip on cross-site POST
-            same_site = params.get('samesite', '').lower()
-            if same_site == 'lax' and method == 'POST' and cross_site:
-                continue
-            cookies.append(f"{name}={value}")
-        # Remove expired cookies
-        for n in remove_names:
-            jar.pop(n, None)
+                cpath = params.get('path') or '/'
+                if req_path != cpath and not (
+                        req_path.startswith(cpath) and
+                        (cpath.endswith('/') or
+                         req_path[len(cpath):len(cpath) + 1] == '/')):
+                    continue
+                selected.append((-len(cpath), seq, name, value))
+            selected.sort()
+            for _, _, name, value in selected:
+                cookies.append(f"{name}={value}")
         if cookies:
-            req += f"Cookie: {'; '.join(cookies)}\r\n"
+            parts.append(f"Cookie: {'; '.join(cookies)}\r\n".encode("utf8"))
         # Content headers
         if payload is not None:
-            length = len(payload.encode("utf8"))
-            req += "Content-Type: application/x-www-form-urlencoded\r\n"
-            req += f"Content-Length: {length}\r\n"
-        req += "\r\n"
-        if payload is not None:
-            req += payload
-        # Send request
-        s.send(req.encode("utf8"))
-        # Read response
-        # Read response in binary mode. Header lines are decoded, body is left as bytes.
-        resp = s.makefile("b")
+            payload_bytes = payload.encode("utf8")
+            parts.append(b"Content-Type: application/x-www-form-urlencoded\r\n")
+            parts.append(f"Content-Length: {len(payload_bytes)}\r\n".encode("utf8"))
+            parts.append(b"\r\n")
+            parts.append(payload_bytes)
+        else:
+            parts.append(b"\r\n")
+        request_bytes = b"".join(parts)
+        # Send over a pooled connection when one is available. A pooled
+        # socket can still die between the staleness check and the send,
+        # so if the reply never arrives, retry once on a fresh connection.
+        pool_key = (self.scheme, self.host, self.port)
+        status_line = b""
+        for from_pool in (True, False):
+            conn = _pool_take(pool_key) if from_pool else None
+            if from_pool and conn is None:
+                continue
+            if conn is not None:
+                s, resp = conn
+            else:
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+                s.connect((self.host, self.port))
+                if self.scheme == "https":
+                    try:
+                        s = _ssl_ctx().wrap_socket(
+                            s, server_hostname=self.host,
+                            session=_TLS_SESSIONS.get(self.host))
+                        if s.session:
+                            _TLS_SESSIONS[self.host] = s.session
+                    except ssl.SSLError:
+                        # Certificate errors will propagate to caller
+                        s.close()
+                        raise
+                # Read responses in binary mode. Header lines are
+                # decoded, body is left as bytes.
+                resp = s.makefile("b")
+            try:
+                s.sendall(request_bytes)
+                status_line = resp.readline()
+            except OSError:
+                status_line = b""
+            if status_line:
+                break
+            try:
+                s.close()
+            except Exception:
+                pass
         # Status line
-        _ = resp.readline().decode("utf8", "ignore")
+        status_str = status_line.decode("utf8", "ignore")
         headers: dict[str, str] = {}
+        set_cookies: list[str] = []
         while True:
             line = resp.readline()
             if not line:
@@ -383,51 +612,119 @@ class URL:
             k, v = line_str.split(":", 1)
             k_lower = k.casefold()
             v = v.strip()
-            # Collect duplicate headers (e.g., Set-Cookie)
-            if k_lower in headers and k_lower == "set-cookie":
-                headers[k_lower] += ", " + v
+            # Collect repeated Set-Cookie headers as a list: joining
+            # them with ", " and re-splitting was both an extra pass
+            # and wrong, since Expires dates legally contain commas.
+            if k_lower == "set-cookie":
+                set_cookies.append(v)
             else:
                 headers[k_lower] = v
-        # Read the rest of the body as bytes
-        body = resp.read()
-        s.close()
-        # Store cookies from Set-Cookie header
-        sc = headers.get("set-cookie")
-        if sc:
-            # There may be multiple cookies separated by comma
-            cookie_headers = [x.strip() for x in sc.split(",")]
-            for cookie_str in cookie_headers:
-                if not cookie_str:
-                    continue
-                parts = [p.strip() for p in cookie_str.split(";")]
-                if not parts:
-                    continue
-                name_value = parts[0]
-                if "=" not in name_value:
+        # Read the body. HTTP/1.1 responses are delimited by
+        # Content-Length or chunked transfer coding; only when neither
+        # is present (an HTTP/1.0-era server) do we fall back to
+        # read-to-EOF, which also rules out reusing the connection.
+        framed = True
+        te = headers.get("transfer-encoding", "").lower()
+        if "chunked" in te:
+            chunks = []
+            while True:
+                size_line = resp.readline()
+                if not size_line:
+                    framed = False
+                    break
+                try:
+                    size = int(size_line.strip().split(b";")[0], 16)
+                except ValueError:
+                    framed = False
+                    break
+                if size == 0:
+                    # Consume optional trailers up to the blank line
+                    while True:
+                        t = resp.readline()
+                        if not t or t == b"\r\n":
+                            break
+                    break
+                chunks.append(resp.read(size))
+                resp.readline()  # CRLF terminating the chunk
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            try:
+                clen = int(headers["content-length"])
+            except ValueError:
+                clen = None
+            if clen is None:
+                body = resp.read()
+                framed = False
+            else:
+                # Read straight into one preallocated buffer sized from
+                # Content-Length: a single allocation and no
+                # intermediate chunk copies inside the io stack.
+                buf = bytearray(clen)
+                view = memoryview(buf)
+                got = 0
+                while got < clen:
+                    n = resp.readinto(view[got:])
+                    if not n:
+                        break
+                    got += n
+                if got < clen:
+                    body = bytes(buf[:got])
+                    framed = False
+                else:
+                    body = bytes(buf)
+        else:
+            body = resp.read()
+            framed = False
+        # Decompress gzip bodies (we advertise Accept-Encoding: gzip);
+        # typical HTML compresses 5-10x, so this trades a little CPU
+        # for most of the transfer time. 16+MAX_WBITS tells zlib to
+        # expect the gzip wrapper.
+        if headers.get("content-encoding", "").lower() == "gzip":
+            try:
+                body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+            except zlib.error:
+                # Serve the raw bytes if the stream turns out mangled
+                pass
+        # Keep the connection for reuse unless the server opted out
+        conn_hdr = headers.get("connection", "").lower()
+        if framed and "close" not in conn_hdr and \
+                status_str.startswith("HTTP/1.1"):
+            _pool_give(pool_key, s, resp)
+        else:
+            try:
+                s.close()
+            except Exception:
+                pass
+        # Store cookies: one Set-Cookie header per cookie, scanned in a
+        # single pass over each header's attribute list.
+        for cookie_str in set_cookies:
+            cookie_str = cookie_str.strip()
+            if not cookie_str:
+                continue
+            semi = cookie_str.find(";")
+            name_value = cookie_str if semi < 0 else cookie_str[:semi]
+            eq = name_value.find("=")
+            if eq < 0:
+                continue
+            name = name_value[:eq].strip()
+            val = name_value[eq + 1:].strip()
+            params: dict[str, str] = {}
+            i = semi
+            while i >= 0:
+                nxt = cookie_str.find(";", i + 1)
+                part = (cookie_str[i + 1:] if nxt < 0
+                        else cookie_str[i + 1:nxt]).strip()
+                i = nxt
+                if not part:
                     continue
-                name, val = name_value.split("=", 1)
-                params: dict[str, str] = {}
-                for part in parts[1:]:
-                    if not part:
-                        continue
-                    if "=" in part:
-                        k_p, v_p = part.split("=", 1)
-                        key = k_p.casefold()
-                        params[key] = v_p
-                    else:
-                        key = part.casefold()
-                        params[key] = ""
-                # Convert Expires to timestamp if possible
-                if 'expires' in params:
-                    exp_val = params['expires']
-                    try:
-                        # Try to parse to timestamp
-                        dt = email.utils.parsedate_to_datetime(str(exp_val))
-                        params['expires'] = dt.timestamp()
-                    except Exception:
-                        pass
-                # Save cookie
-                COOKIE_JAR.setdefault(jar_key, {})[name] = (val, params)
+                eq = part.find("=")
+                if eq >= 0:
+                    params[part[:eq].casefold()] = part[eq + 1:]
+                else:
+                    params[part.casefold()] = ""
+            # Save cookie (normalizes expires/samesite, updates
+            # NEXT_EXPIRY)
+            _store_cookie(jar_key, name, val, params)
         return headers, body
 
     def resolve(self, url):
@@ -476,9 +773,34 @@ def print_tree(node, indent=0):
         print_tree(c, indent + 1)
 
 def tree_to_list(tree, out):
-    out.append(tree)
-    for c in getattr(tree, "children", []):
-        tree_to_list(c, out)
+    # Iterative preorder: no Python-frame overhead per node and no
+    # recursion-depth limit on pathologically deep documents.
+    stack = [tree]
+    while stack:
+        n = stack.pop()
+        out.append(n)
+        children = getattr(n, "children", None)
+        if children:
+            stack.extend(reversed(children))
+    return out
+
+def walk_by_tag(root, tag):
+    """
+    Collect all Elements under root (inclusive) with the given tag.
+    Iterative with an explicit stack: no recursion overhead and no
+    intermediate list of every node the way tree_to_list + filter has.
+    Hot path for form submission (collecting <input> descendants).
+    """
+    out = []
+    stack = [root]
+    while stack:
+        n = stack.pop()
+        if isinstance(n, Element) and n.tag == tag:
+            out.append(n)
+        children = n.children
+        # push in reverse so traversal stays in document order
+        for i in range(len(children) - 1, -1, -1):
+            stack.append(children[i])
     return out
 
 class HTMLParser:
@@ -495,33 +817,69 @@ class HTMLParser:
         self.unfinished = []
 
     def parse(self):
-        text = ""; in_tag = False
-        for c in self.body:
-            if c == "<":
-                in_tag = True
-                if text: self.add_text(text); text = ""
-            elif c == ">":
-                in_tag = False
-                self.add_tag(text); text = ""
-            else:
-                text += c
-        if not in_tag and text:
-            self.add_text(text)
+        # Scan for tag delimiters with str.find and slice out whole runs
+        # of text and tag contents, instead of walking the document one
+        # character at a time.
+        body = self.body
+        i = 0; n = len(body)
+        while i < n:
+            j = body.find("<", i)
+            if j < 0:
+                tail = body[i:]
+                if not tail.isspace():
+                    self.add_text(tail)
+                break
+            if j > i:
+                # Markup indentation produces lots of whitespace-only
+                # runs between tags; filtering them here skips the
+                # add_text call (and its implicit-tag checks) entirely.
+                run = body[i:j]
+                if not run.isspace():
+                    self.add_text(run)
+            k = body.find(">", j + 1)
+            if k < 0:
+                break
+            self.add_tag(body[j + 1:k])
+            i = k + 1
         return self.finish()
 
     def get_attributes(self, text):
-        parts = text.split()
-        if not parts: return "", {}
-        tag = parts[0].casefold()
+        # Single left-to-right scan over the tag text: one pass instead
+        # of split() plus re-parsing each piece, and quoted values keep
+        # their spaces (title="hello world" used to break apart).
+        n = len(text)
+        i = 0
+        while i < n and text[i].isspace(): i += 1
+        start = i
+        while i < n and not text[i].isspace(): i += 1
+        # Interning the tag and attribute keys makes every hot compare
+        # (node.tag == "input", "href" in attributes, dict probes) start
+        # with a pointer-identity hit instead of a character walk.
+        tag = sys.intern(text[start:i].casefold())
         attributes = {}
-        for attrpair in parts[1:]:
-            if "=" in attrpair:
-                key, value = attrpair.split("=", 1)
-                if len(value) > 2 and value[0] in ["'", '"']:
-                    value = value[1:-1]
-                attributes[key.casefold()] = value
+        while i < n:
+            while i < n and text[i].isspace(): i += 1
+            if i >= n: break
+            start = i
+            while i < n and not text[i].isspace() and text[i] != "=":
+                i += 1
+            key = text[start:i].casefold()
+            if i < n and text[i] == "=":
+                i += 1
+                if i < n and (text[i] == "'" or text[i] == '"'):
+                    q = text[i]; i += 1
+                    end = text.find(q, i)
+                    if end < 0: end = n
+                    value = text[i:end]
+                    i = end + 1
+                else:
+                    start = i
+                    while i < n and not text[i].isspace(): i += 1
+                    value = text[start:i]
             else:
-                attributes[attrpair.casefold()] = ""
+                value = ""
+            if key:
+                attributes[sys.intern(key)] = value
         return tag, attributes
 
     def implicit_tags(self, tag):
@@ -596,6 +954,13 @@ class DescendantSelector:
             node = node.parent
         return False
 
+# Character-class scans for CSSParser, compiled once. re.match consumes
+# a whole run in C instead of two Python-level tests per character.
+# [^\W_] is "alphanumeric, no underscore" -- the same set .isalnum()
+# accepts -- plus the literal CSS value characters.
+_CSS_WORD_RE = re.compile(r'(?:[^\W_]|[#\-.%])+')
+_CSS_WS_RE = re.compile(r'\s+')
+
 class CSSParser:
     """
     A very small CSS parser used for parsing author style sheets. It
@@ -608,8 +973,9 @@ class CSSParser:
         self.i = 0
 
     def whitespace(self) -> None:
-        while self.i < len(self.s) and self.s[self.i].isspace():
-            self.i += 1
+        m = _CSS_WS_RE.match(self.s, self.i)
+        if m:
+            self.i = m.end()
 
     def literal(self, literal: str) -> None:
         if not (self.i < len(self.s) and self.s[self.i] == literal):
@@ -617,21 +983,25 @@ class CSSParser:
         self.i += 1
 
     def word(self) -> str:
-        start = self.i
-        while self.i < len(self.s) and (
-            self.s[self.i].isalnum() or self.s[self.i] in "#-.%"
-        ):
-            self.i += 1
-        if not (self.i > start):
+        m = _CSS_WORD_RE.match(self.s, self.i)
+        if not m:
             raise Exception("Expected word")
-        return self.s[start:self.i]
+        self.i = m.end()
+        return m.group()
 
     def ignore_until(self, chars: list[str]) -> str | None:
-        while self.i < len(self.s):
-            if self.s[self.i] in chars:
-                return self.s[self.i]
-            self.i += 1
-        return None
+        # str.find per target character runs in C; jump to the nearest.
+        s = self.s
+        best = -1
+        for c in chars:
+            j = s.find(c, self.i)
+            if j >= 0 and (best < 0 or j < best):
+                best = j
+        if best < 0:
+            self.i = len(s)
+            return None
+        self.i = best
+        return s[best]
 
     def pair(self) -> tuple[str, str]:
         prop = self.word()
@@ -639,7 +1009,11 @@ class CSSParser:
         self.literal(":")
         self.whitespace()
         val = self.word()
-        return prop.casefold(), val
+        # Intern both halves: the same property names and a small set of
+        # values ("black", "16px", ...) recur across every rule and every
+        # node.style dict, so sharing one string object makes the dict
+        # hashing in style() a pointer compare and cuts memory.
+        return sys.intern(prop.casefold()), sys.intern(val)
 
     def body(self) -> dict[str, str]:
         pairs: dict[str, str] = {}
@@ -693,6 +1067,79 @@ def cascade_priority(rule):
     selector, _ = rule
     return selector.priority
 
+def _compile_matcher(sel):
+    """
+    Compile a selector object into a plain callable. Tag selectors
+    become a closure doing one isinstance plus one string compare;
+    descendant selectors compose compiled halves around the ancestor
+    walk. The closure is cached on the selector as `_match`, so the
+    per-node match in style() avoids repeated method dispatch.
+    """
+    if isinstance(sel, TagSelector):
+        tag = sel.tag
+        def match(node):
+            return isinstance(node, Element) and node.tag == tag
+        return match
+    if isinstance(sel, DescendantSelector):
+        if isinstance(sel.ancestor, TagSelector) and \
+           isinstance(sel.descendant, TagSelector):
+            # Tag-under-tag, the common shape: the style() walk leaves
+            # the set of ancestor tags on each node, turning the
+            # O(depth) parent walk into one membership check.
+            atag = sel.ancestor.tag
+            dtag = sel.descendant.tag
+            def match(node):
+                if not (isinstance(node, Element) and node.tag == dtag):
+                    return False
+                anc = getattr(node, "_anc", None)
+                if anc is not None:
+                    return atag in anc
+                p = node.parent
+                while p:
+                    if isinstance(p, Element) and p.tag == atag:
+                        return True
+                    p = p.parent
+                return False
+            return match
+        anc = getattr(sel.ancestor, "_match", None) or _compile_matcher(sel.ancestor)
+        desc = getattr(sel.descendant, "_match", None) or _compile_matcher(sel.descendant)
+        def match(node):
+            if not desc(node):
+                return False
+            p = node.parent
+            while p:
+                if anc(p):
+                    return True
+                p = p.parent
+            return False
+        return match
+    # Unknown selector kind: fall back to its matches method
+    return sel.matches
+
+# Cache of parsed stylesheet rules keyed by the resolved URL string,
+# as (fetch timestamp, rules). Parsing CSS is pure-Python recursive
+# descent, so re-navigating to pages that share a stylesheet should hit
+# this cache instead of re-fetching and re-parsing the same bytes; the
+# TTL keeps a long-lived browser from pinning stale sheets forever.
+_CSS_RULES_CACHE: dict[str, tuple[float, list]] = {}
+_CSS_CACHE_TTL = 300.0
+
+def _css_cache_get(key: str):
+    """Cached rules for a stylesheet URL, or None if absent/expired."""
+    entry = _CSS_RULES_CACHE.get(key)
+    if entry is None:
+        return None
+    if time.time() - entry[0] >= _CSS_CACHE_TTL:
+        _CSS_RULES_CACHE.pop(key, None)
+        return None
+    return entry[1]
+
+# Fetched script text keyed by the resolved URL string. Script side
+# effects are per-JSContext, but the bytes are identical across pages
+# of a site sharing frameworks/analytics, so navigations re-schedule
+# the cached text instead of re-fetching it.
+_SCRIPT_BODY_CACHE: dict[str, str] = {}
+
 # UA stylesheet as Python objects (robust)
 DEFAULT_STYLE_SHEET = [
     (TagSelector("body"), {"background-color": "white", "color": "black"}),
@@ -762,13 +1209,72 @@ def get_font(size, weight, style):
         # TK_ACTIVE not defined yet; fall through to Tk path
         pass
 
-    # Tk path (unchanged)
+    # Tk path: the FONTS entry itself keeps the tkinter.font.Font (and
+    # its Tcl font object) alive; the old throwaway Label per font paid
+    # a full widget construction for the same effect.
     key = (size, weight, style)
-    if key not in FONTS:
-        font = tkinter.font.Font(size=size, weight=weight, slant=style)
-        label = tkinter.Label(font=font)
-        FONTS[key] = (font, label)
-    return FONTS[key][0]
+    font = FONTS.get(key)
+    if font is None:
+        font = FONTS[key] = tkinter.font.Font(
+            size=size, weight=weight, slant=style)
+    return font
+
+def _parse_px(s, default=16.0):
+    """Parse the leading number out of a CSS length like "16px".
+    Scans digits and dots and stops at the first other character: no
+    slice allocation for the unit and no exception machinery on
+    malformed values."""
+    i = 0; n = len(s)
+    while i < n and (s[i].isdigit() or s[i] == '.'):
+        i += 1
+    if not i:
+        return default
+    try:
+        return float(s[:i])
+    except ValueError:
+        return default
+
+@functools.lru_cache(maxsize=4096)
+def font_metrics(font):
+    """(ascent, descent, linespace) for a font, computed once. Each
+    metrics() call is a Tcl round-trip, and layout asks for the same
+    three numbers for every fragment on every line."""
+    m = font.metrics()
+    return (m["ascent"], m["descent"], m["linespace"])
+
+_ASCII_W: dict = {}
+
+def ascii_widths(font):
+    """128-entry character-width table for a font, built on first use
+    (128 Tcl round-trips once, then never again for that font)."""
+    a = _ASCII_W.get(font)
+    if a is None:
+        a = [font.measure(chr(c)) for c in range(128)]
+        _ASCII_W[font] = a
+    return a
+
+@functools.lru_cache(maxsize=2048)
+def _resolve_font(size_str, weight, style_in):
+    """Resolve (font, linespace) from raw style strings. Runs of words
+    sharing a style collapse to one cache hit instead of re-parsing the
+    size and re-branching on the slant per word."""
+    style = "roman" if style_in == "normal" else style_in
+    font = get_font(int(_parse_px(size_str) * 0.75), weight, style)
+    return font, font_metrics(font)[2]
+
+@functools.lru_cache(maxsize=65536)
+def _measure_word(font, word):
+    """Memoized font.measure. Each Tk measure is a round-trip into the
+    Tcl interpreter, and prose keeps re-measuring the same words (and
+    " " once per word); fonts come from the FONTS cache, so the small
+    set of font objects makes (font, word) an effective key. ASCII-only
+    words (the vast majority in English text) are summed from a per-font
+    character-width table instead of calling into Tcl at all; Tk does
+    not kern, so the sum matches measure() for these fonts."""
+    if word.isascii():
+        a = ascii_widths(font)
+        return sum(a[ord(c)] for c in word)
+    return font.measure(word)
 
 WIDTH, HEIGHT = 800, 600
 HSTEP, VSTEP = 13, 18
@@ -793,33 +1299,119 @@ INHERITED_PROPERTIES = {
     "color": "black",
 }
 
+def index_rules(rules):
+    """Bucket rules by the tag of their rightmost TagSelector, so each
+    node only scans rules whose terminal selector could match it
+    instead of the whole stylesheet. Selectors of unrecognized shape
+    land in the catch-all bucket (key "") scanned for every node.
+    Cascade order within each bucket is preserved, including relative
+    to catch-all rules."""
+    by_tag: dict[str, list] = {}
+    catch_all: list = []
+    for i, (sel, body) in enumerate(rules):
+        s = sel
+        while isinstance(s, DescendantSelector):
+            s = s.descendant
+        if isinstance(s, TagSelector):
+            by_tag.setdefault(s.tag, []).append((i, sel, body))
+        else:
+            catch_all.append((i, sel, body))
+    if catch_all:
+        for bucket in by_tag.values():
+            bucket += catch_all
+            bucket.sort(key=lambda t: t[0])
+    index = {tag: [(sel, body) for _, sel, body in bucket]
+             for tag, bucket in by_tag.items()}
+    index[""] = [(sel, body) for _, sel, body in catch_all]
+    return index
+
 def style(node, rules):
-    node.style = {}
-    for prop, default_value in INHERITED_PROPERTIES.items():
-        if node.parent: node.style[prop] = node.parent.style[prop]
-        else: node.style[prop] = default_value
-    for selector, body in rules:
-        if selector.matches(node):
-            for p, v in body.items():
-                node.style[p] = v
-
-    # Inline style parsing (chapter 11)
-    if isinstance(node, Element) and "style" in getattr(node, 'attributes', {}):
-        for decl in node.attributes.get("style",""
-                    ).split(";"):
-            if ":" in decl:
-                k,v = decl.split(":",1)
-                node.style[k.strip().casefold()] = v.strip()
-
-    # Defaults for chapter 11 visual effects
-    node.style.setdefault("background-color", "transparent")
-    node.style.setdefault("border-radius", "0px")
-    if node.style["font-size"].endswith("%"):
-        parent_px = float((node.parent.style["font-size"] if node.parent else INHERITED_PROPERTIES["font-size"])[:-2])
-        node_pct = float(node.style["font-size"][:-1]) / 100
-        node.style["font-size"] = str(node_pct * parent_px) + "px"
-    for c in node.children:
-        style(c, rules)
+    # Iterative preorder walk: each parent is styled before its
+    # children pop off the stack, so inheritance and %-font-size
+    # resolution always read a finished parent style.
+    index = index_rules(rules)
+    catch_all = index[""]
+    # Snapshot the inherited defaults once per walk, not once per node.
+    # Taken fresh each call because render() flips the default color in
+    # INHERITED_PROPERTIES when dark mode toggles.
+    inherited_items = tuple(INHERITED_PROPERTIES.items())
+    # Seed the root's ancestor-tag set (usually empty: style() starts
+    # at the document root). Children get theirs as the walk descends;
+    # descendant selectors then match with one membership check.
+    tags = []
+    p = node.parent
+    while p:
+        if isinstance(p, Element):
+            tags.append(p.tag)
+        p = p.parent
+    node._anc = frozenset(tags)
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        parent = node.parent
+        if parent is not None:
+            pstyle = parent.style
+            ns = node.style = {prop: pstyle[prop]
+                               for prop, _ in inherited_items}
+        else:
+            ns = node.style = dict(inherited_items)
+        # Only Elements can match tag-keyed rules; Text nodes see just
+        # the catch-all bucket.
+        if isinstance(node, Element):
+            bucket = index.get(node.tag) or catch_all
+        else:
+            bucket = catch_all
+        for selector, body in bucket:
+            match = getattr(selector, "_match", None)
+            if match is None:
+                match = selector._match = _compile_matcher(selector)
+            if match(node):
+                for p, v in body.items():
+                    ns[p] = v
+
+        # Inline style parsing (chapter 11)
+        if isinstance(node, Element) and "style" in getattr(node, 'attributes', {}):
+            for decl in node.attributes.get("style",""
+                        ).split(";"):
+                if ":" in decl:
+                    k,v = decl.split(":",1)
+                    # Interned like parsed rules, so inline styles share
+                    # the same key/value objects
+                    ns[sys.intern(k.strip().casefold())] = sys.intern(v.strip())
+
+        # Defaults for chapter 11 visual effects
+        ns.setdefault("background-color", "transparent")
+        ns.setdefault("border-radius", "0px")
+        if ns["font-size"].endswith("%"):
+            parent_px = float((parent.style["font-size"] if parent else INHERITED_PROPERTIES["font-size"])[:-2])
+            node_pct = float(ns["font-size"][:-1]) / 100
+            ns["font-size"] = str(node_pct * parent_px) + "px"
+        # Precompute what layout reads in its innermost loop: the pixel
+        # size as a float and the Tk slant name, so word()/input() skip
+        # a float() parse and a string compare per token.
+        ns["_font_px"] = _parse_px(ns["font-size"])
+        st = ns["font-style"]
+        ns["_font_slant"] = "roman" if st == "normal" else st
+        # Resolve the (unzoomed) font once per node: every TextLayout /
+        # InputLayout under this node shares it, so per-word resolution
+        # collapses to an attribute read. When no Tk root is live yet,
+        # get_font fails and layout falls back to resolving itself.
+        try:
+            node._font = get_font(int(ns["_font_px"] * 0.75),
+                                  ns["font-weight"], ns["_font_slant"])
+            node._linespace = font_metrics(node._font)[2]
+        except Exception:
+            node._font = None
+        children = node.children
+        if children:
+            if isinstance(node, Element) and node.tag not in node._anc:
+                child_anc = node._anc | {node.tag}
+            else:
+                child_anc = node._anc
+            for i in range(len(children) - 1, -1, -1):
+                c = children[i]
+                c._anc = child_anc
+                stack.append(c)
 
 
 def _px_from_length(value: str, x1, y1, x2, y2):
@@ -843,6 +1435,7 @@ def _px_from_length(value: str, x1, y1, x2, y2):
     except Exception:
         raise NotImplementedError(f"Unsupported length value: {value}")
 
+@functools.lru_cache(maxsize=1024)
 def _parse_color(c: str):
     NAMED = {
         "black": 0xFF000000, "white": 0xFFFFFFFF, "gray": 0xFF808080,
@@ -885,8 +1478,13 @@ class DocumentLayout:
         # Update zoom if provided
         if zoom is not None:
             self.zoom = zoom
-        child = BlockLayout(self.node, self, None)
-        self.children = [child]
+        # Reuse the existing BlockLayout tree when it was built for this
+        # DOM root; layout() below resets per-frame state itself.
+        if self.children and self.children[0].node is self.node:
+            child = self.children[0]
+        else:
+            child = BlockLayout(self.node, self, None)
+            self.children = [child]
         # Compute width and position scaled by zoom
         # Subtract space for horizontal padding and scrollbar
         self.width = (WIDTH - SCROLLBAR_WIDTH) - 2 * dpx(HSTEP, self.zoom)
@@ -897,6 +1495,30 @@ class DocumentLayout:
     def paint(self): return []
     def should_paint(self): return True
 
+# Display-item constructors keyed by item tag. BlockLayout.paint runs
+# once per item in the display list; one dict lookup plus one call
+# replaces the five-way elif chain. The lambdas resolve the Draw*
+# classes (defined below) at call time.
+# Interned kind tags shared by the producers below and the dispatch
+# table, so the per-item dict lookup in paint() compares one string
+# object instead of hashing fresh literals.
+KIND_TEXT = sys.intern("text_abs")
+KIND_RECT = sys.intern("rect")
+KIND_RRECT = sys.intern("rrect")
+KIND_LINE = sys.intern("line")
+KIND_OUTLINE = sys.intern("outline")
+KIND_IMAGE = sys.intern("image")
+
+_DISPLAY_ITEM_MAKERS = {
+    KIND_TEXT:    lambda it: DrawText(it[1][0], it[1][1], it[2], it[3], it[4]),
+    KIND_RECT:    lambda it: DrawRect(it[1][0], it[1][1], it[1][2], it[1][3], it[2]),
+    KIND_RRECT:   lambda it: DrawRRect(it[1][0], it[1][1], it[1][2], it[1][3], it[2], it[3]),
+    KIND_LINE:    lambda it: DrawLine(it[1][0], it[1][1], it[1][2], it[1][3], it[1][4], it[1][5]),
+    KIND_OUTLINE: lambda it: DrawOutline(it[1][0], it[1][1], it[1][2], it[1][3], it[2], it[3]),
+    KIND_IMAGE:   lambda it: DrawImage(
+        it[1], it[2], parse_image_rendering(it[3]) if SKIA_OK else None),
+}
+
 class BlockLayout:
     def __init__(self, node, parent, previous):
         self.node = node
@@ -929,14 +1551,28 @@ class BlockLayout:
         self.x = self.parent.x
         self.width = self.parent.width
         self.y = (self.previous.y + self.previous.height) if self.previous else self.parent.y
+        # Per-layout state reset so this object can be laid out again
+        # (the tree is recycled across renders); the stale should_paint
+        # memo from the previous frame goes with it. clear() reuses the
+        # list allocation frame over frame.
+        self.display_list.clear()
+        self._paint_visible = None
         mode = self.layout_mode()
         if mode == "block":
-            prev = None
-            for c in self.node.children:
-                child = BlockLayout(c, self, prev)
-                self.children.append(child)
-                prev = child
+            # Recycle existing child layouts when they still mirror the
+            # DOM children; otherwise rebuild the row of BlockLayouts.
+            kids = self.node.children
+            cur = self.children
+            if not (len(cur) == len(kids) and
+                    all(c.node is k for c, k in zip(cur, kids))):
+                self.children = []
+                prev = None
+                for c in kids:
+                    child = BlockLayout(c, self, prev)
+                    self.children.append(child)
+                    prev = child
         else:
+            self.children = []
             self.cursor_x = 0; self.cursor_y = 0
             self.line = []
             self.recurse(self.node)
@@ -971,7 +1607,7 @@ class BlockLayout:
                     break
 
             default_font = get_font(12, "normal", "roman")
-            self.height = max((last_y - self.y) + default_font.metrics("linespace"), VSTEP)
+            self.height = max((last_y - self.y) + font_metrics(default_font)[2], VSTEP)
 
 
     def recurse(self, node):
@@ -992,24 +1628,31 @@ class BlockLayout:
                     self.recurse(c)
 
     def word(self, node, word):
-        weight = node.style["font-weight"]
-        style = node.style["font-style"]
-        if style == "normal": style = "roman"
-        # Compute font size in points. CSS pixels are multiplied by 0.75 to
-        # convert to points, then scaled by zoom via dpx(). This yields a
-        # consistent font size under zoom.
-        try:
-            px_size = float(node.style["font-size"][:-2])
-        except Exception:
-            px_size = 16.0
+        ns = node.style
+        weight = ns["font-weight"]
+        # Slant and pixel size are precomputed by style(); fall back to
+        # parsing for nodes that have not been styled yet.
+        style = ns.get("_font_slant")
+        if style is None:
+            style = ns["font-style"]
+            if style == "normal": style = "roman"
+        px_size = ns.get("_font_px")
+        if px_size is None:
+            try:
+                px_size = float(ns["font-size"][:-2])
+            except Exception:
+                px_size = 16.0
+        # Font size in points: CSS pixels are multiplied by 0.75 to
+        # convert to points, then scaled by zoom via dpx(). This yields
+        # a consistent font size under zoom.
         size_pt = dpx(px_size * 0.75, getattr(self, 'zoom', 1.0))
         font = get_font(int(size_pt), weight, style)
         color = node.style["color"]
-        w = font.measure(word)
+        w = _measure_word(font, word)
         if self.cursor_x + w > self.width:
             self.flush()
         self.line.append(("text", self.cursor_x, word, font, color))
-        self.cursor_x += w + font.measure(" ")
+        self.cursor_x += w + _measure_word(font, " ")
 
     def input(self, node):
         # Determine input type; treat default as text
@@ -1018,13 +1661,18 @@ class BlockLayout:
         if itype == "hidden":
             return
         # compute font used inside widget, scaling size by zoom
-        weight = node.style["font-weight"]
-        style = node.style["font-style"]
-        if style == "normal": style = "roman"
-        try:
-            px_size = float(node.style["font-size"][:-2])
-        except Exception:
-            px_size = 16.0
+        ns = node.style
+        weight = ns["font-weight"]
+        style = ns.get("_font_slant")
+        if style is None:
+            style = ns["font-style"]
+            if style == "normal": style = "roman"
+        px_size = ns.get("_font_px")
+        if px_size is None:
+            try:
+                px_size = float(ns["font-size"][:-2])
+            except Exception:
+                px_size = 16.0
         size_pt = dpx(px_size * 0.75, getattr(self, 'zoom', 1.0))
         font = get_font(int(size_pt), weight, style)
 
@@ -1037,20 +1685,20 @@ class BlockLayout:
             if node.tag == "input":
                 base_w = INPUT_WIDTH_PX
             else:
-                base_w = max(80, font.measure(self.button_label(node)) + 20)
+                base_w = max(80, _measure_word(font, self.button_label(node)) + 20)
             w = dpx(base_w, getattr(self, 'zoom', 1.0))
 
         if self.cursor_x + w > self.width:
             self.flush()
 
-        metrics = font.metrics()
-        max_ascent = metrics["ascent"]
+        ascent, _, linespace = font_metrics(font)
+        max_ascent = ascent
         baseline = self.cursor_y + max_ascent
         x = self.x + self.cursor_x
         # Compute vertical extents, scaling checkbox height by zoom
-        y_top = self.y + baseline - font.metrics("ascent")
+        y_top = self.y + baseline - ascent
         # Height: checkbox size or font line spacing scaled by zoom
-        h = dpx(CHECKBOX_SIZE, getattr(self, 'zoom', 1.0)) if is_checkbox else font.metrics("linespace")
+        h = dpx(CHECKBOX_SIZE, getattr(self, 'zoom', 1.0)) if is_checkbox else linespace
         y_bottom = y_top + h
         rect = (x, y_top, x + w, y_bottom)
 
@@ -1060,20 +1708,20 @@ class BlockLayout:
         # background/box
         if is_checkbox:
             # draw a square outline; fill light background
-            self.display_list.append(("rect", rect, "#e6f2ff"))
-            self.display_list.append(("outline", rect, "black", 1))
+            self.display_list.append((KIND_RECT, rect, "#e6f2ff"))
+            self.display_list.append((KIND_OUTLINE, rect, "black", 1))
             # draw check if checked
             checked = ("checked" in node.attributes) or (node.attributes.get("_checked_state") == "true")
             if checked:
                 # simple X check
-                self.display_list.append(("line", (x+3, y_top+3, x+w-3, y_bottom-3, "black", 2)))
-                self.display_list.append(("line", (x+w-3, y_top+3, x+3, y_bottom-3, "black", 2)))
+                self.display_list.append((KIND_LINE, (x+3, y_top+3, x+w-3, y_bottom-3, "black", 2)))
+                self.display_list.append((KIND_LINE, (x+w-3, y_top+3, x+3, y_bottom-3, "black", 2)))
         else:
             bgcolor = node.style.get("background-color", "transparent")
             if bgcolor != "transparent":
                 br = node.style.get("border-radius", "0px")
                 radius = _px_from_length(br, *rect)
-                self.display_list.append(("rrect", rect, bgcolor, radius))
+                self.display_list.append((KIND_RRECT, rect, bgcolor, radius))
 
             # Determine displayed text for input or button
             if node.tag == "input":
@@ -1086,13 +1734,13 @@ class BlockLayout:
             else:
                 text = self.button_label(node)
             color = node.style["color"]
-            self.display_list.append(("text_abs", (x, y_top), text, font, color))
+            self.display_list.append((KIND_TEXT, (x, y_top), text, font, color))
             if node.is_focused and node.tag == "input":
-                cx = x + font.measure(text)
-                self.display_list.append(("line", (cx, y_top, cx, y_bottom, "black", 1)))
+                cx = x + _measure_word(font, text)
+                self.display_list.append((KIND_LINE, (cx, y_top, cx, y_bottom, "black", 1)))
 
         # advance cursor
-        self.cursor_x += w + font.measure(" ")
+        self.cursor_x += w + _measure_word(font, " ")
 
     def image(self, node):
         """
@@ -1154,8 +1802,7 @@ class BlockLayout:
         if self.cursor_x + w > self.width:
             self.flush()
         # Compute baseline: align bottom of image with baseline
-        metrics = font.metrics()
-        max_ascent = metrics["ascent"]
+        max_ascent = font_metrics(font)[0]
         baseline = self.cursor_y + max_ascent
         x = self.x + self.cursor_x
         y_bottom = self.y + baseline
@@ -1163,9 +1810,9 @@ class BlockLayout:
         rect = (x, y_top, x + w, y_bottom)
         # Append to display list: ("image", rect, image, quality)
         quality = node.style.get("image-rendering", "auto")
-        self.display_list.append(("image", rect, node.image, quality))
+        self.display_list.append((KIND_IMAGE, rect, node.image, quality))
         # Advance cursor, including space after image
-        self.cursor_x += w + font.measure(" ")
+        self.cursor_x += w + _measure_word(font, " ")
 
     def button_label(self, node):
         if len(node.children) == 1 and isinstance(node.children[0], Text):
@@ -1174,14 +1821,14 @@ class BlockLayout:
 
     def flush(self):
         if not self.line: return
-        metrics = [font.metrics() for _, _, _, font, _ in self.line]
-        max_ascent = max(m["ascent"] for m in metrics)
-        max_descent = max(m["descent"] for m in metrics)
+        metrics = [font_metrics(font) for _, _, _, font, _ in self.line]
+        max_ascent = max(m[0] for m in metrics)
+        max_descent = max(m[1] for m in metrics)
         baseline = self.cursor_y + max_ascent
         for kind, rel_x, word, font, color in self.line:
             x = self.x + rel_x
-            y = self.y + baseline - font.metrics("ascent")
-            self.display_list.append(("text_abs", (x, y), word, font, color))
+            y = self.y + baseline - font_metrics(font)[0]
+            self.display_list.append((KIND_TEXT, (x, y), word, font, color))
         self.cursor_y = baseline + int(1.25 * max_descent)
         self.cursor_x = 0
         self.line = []
@@ -1228,28 +1875,39 @@ class BlockLayout:
         if isinstance(self.node, Element) and self.node.tag == "pre":
             x2, y2 = self.x + self.width, self.y + self.height
             cmds.append(DrawRect(self.x, self.y, x2, y2, "gray"))
+        mk = _DISPLAY_ITEM_MAKERS
+        # Fuse consecutive same-font, same-color words on one baseline
+        # into a single DrawText: each DrawText.execute is one Tk IPC,
+        # so a 5000-word page otherwise pays 5000 round trips per
+        # repaint. Words merge only when the next x lands exactly one
+        # space past the previous word, which is how the cursor advanced
+        # during layout, so the joined string renders identically.
+        run = None  # [x, y, font, color, words, expected next x]
         for item in self.display_list:
-            if item[0] == "text_abs":
-                _, (x,y), word, font, color = item
-                cmds.append(DrawText(x, y, word, font, color))
-            elif item[0] == "rect":
-                _, (x1,y1,x2,y2), color = item
-                cmds.append(DrawRect(x1, y1, x2, y2, color))
-            elif item[0] == "rrect":
-                _, (x1,y1,x2,y2), color, radius = item
-                cmds.append(DrawRRect(x1, y1, x2, y2, color, radius))
-            elif item[0] == "line":
-                _, (x1,y1,x2,y2,color,th) = item
-                cmds.append(DrawLine(x1, y1, x2, y2, color, th))
-            elif item[0] == "outline":
-                _, (x1,y1,x2,y2), color, th = item
-                cmds.append(DrawOutline(x1, y1, x2, y2, color, th))
-            elif item[0] == "image":
-                _, (x1,y1,x2,y2), image_obj, quality = item
-                rect = (x1, y1, x2, y2)
-                # Create draw command for images; compute sampling options
-                qual = parse_image_rendering(quality) if SKIA_OK else None
-                cmds.append(DrawImage(rect, image_obj, qual))
+            kind = item[0]
+            if kind == KIND_TEXT:
+                (x, y), text, font, color = item[1], item[2], item[3], item[4]
+                if run is not None and run[2] is font and run[3] == color \
+                        and run[1] == y and abs(x - run[5]) < 0.5:
+                    run[4].append(text)
+                    run[5] = x + _measure_word(font, text) + _measure_word(font, " ")
+                    continue
+                if run is not None:
+                    cmds.append(DrawText(run[0], run[1], " ".join(run[4]),
+                                         run[2], run[3]))
+                run = [x, y, font, color, [text],
+                       x + _measure_word(font, text) + _measure_word(font, " ")]
+                continue
+            if run is not None:
+                cmds.append(DrawText(run[0], run[1], " ".join(run[4]),
+                                     run[2], run[3]))
+                run = None
+            maker = mk.get(kind)
+            if maker:
+                cmds.append(maker(item))
+        if run is not None:
+            cmds.append(DrawText(run[0], run[1], " ".join(run[4]),
+                                 run[2], run[3]))
         return cmds
 
 # ================= Inline layout classes (Chapter 7+ compatibility) =================
@@ -1269,6 +1927,8 @@ class LineLayout:
     vertically below the previous line, and positions its child layout
     objects (TextLayout or InputLayout) accordingly.
     """
+    __slots__ = ("node", "parent", "previous", "children",
+                 "x", "y", "width", "height", "_visible")
     def __init__(self, node, parent, previous):
         self.node = node
         self.parent = parent
@@ -1278,6 +1938,7 @@ class LineLayout:
         self.y = 0
         self.width = 0
         self.height = 0
+        self._visible = True
 
     def layout(self) -> None:
         # Lines span the full width of the parent block
@@ -1288,19 +1949,37 @@ class LineLayout:
             self.y = self.previous.y + self.previous.height
         else:
             self.y = getattr(self.parent, 'y', 0)
-        # Lay out children (TextLayout or InputLayout)
+        # Lay out children (TextLayout or InputLayout) with a running
+        # cursor, measuring the inter-word space once per distinct font
+        # instead of once per word via the previous-sibling chain.
+        cursor = self.x
+        space_w: dict[int, int] = {}
         for child in self.children:
-            child.layout()
+            child.layout_at(cursor)
+            f = child.font
+            sw = space_w.get(id(f))
+            if sw is None:
+                sw = space_w[id(f)] = _measure_word(f, " ")
+            cursor += child.width + sw
         if not self.children:
             self.height = 0
             return
-        # Compute baseline from maximum ascents/descents of children
-        max_ascent = max(child.font.metrics("ascent") for child in self.children)
-        max_descent = max(child.font.metrics("descent") for child in self.children)
+        # Compute baseline from maximum ascents/descents of children,
+        # fetching each child's metrics once instead of per comprehension
+        max_ascent = 0
+        max_descent = 0
+        ascents = []
+        for child in self.children:
+            ascent, descent, _ = font_metrics(child.font)
+            ascents.append(ascent)
+            if ascent > max_ascent:
+                max_ascent = ascent
+            if descent > max_descent:
+                max_descent = descent
         baseline = self.y + max_ascent
         # Position children relative to baseline
-        for child in self.children:
-            child.y = baseline - child.font.metrics("ascent")
+        for child, ascent in zip(self.children, ascents):
+            child.y = baseline - ascent
         # Height: leave extra space for descenders and line spacing
         self.height = 1.25 * (max_ascent + max_descent)
 
@@ -1309,7 +1988,7 @@ class LineLayout:
         return []
 
     def should_paint(self) -> bool:
-        return True
+        return self._visible
 
 class TextLayout:
     """
@@ -1317,9 +1996,12 @@ class TextLayout:
     measures its width and height, and positions itself next to the
     previous inline object (with a space) or at the start of the line.
     """
+    __slots__ = ("node", "word", "parent", "previous", "children",
+                 "x", "y", "width", "height", "font", "_visible")
     def __init__(self, node, word, parent, previous):
         self.node = node
         self.word = word
+        self._visible = True
         self.parent = parent
         self.previous = previous
         self.children: list = []
@@ -1330,27 +2012,30 @@ class TextLayout:
         self.font = None
 
     def layout(self) -> None:
-        # Compute the font from inherited styles
-        weight = self.node.style.get("font-weight", "normal")
-        style = self.node.style.get("font-style", "normal")
-        if style == "normal":
-            style = "roman"
-        # Default font size is 16px; convert to points (approx 0.75)
-        size_str = self.node.style.get("font-size", "16px")
-        try:
-            px = float(size_str[:-2])
-        except Exception:
-            px = 16.0
-        size = int(px * 0.75)
-        self.font = get_font(size, weight, style)
-        self.width = self.font.measure(self.word)
-        # Place after previous word with a space
+        # Legacy previous-chain entry point; LineLayout.layout calls
+        # layout_at with a running cursor instead.
         if self.previous:
-            space = self.previous.font.measure(" ")
-            self.x = self.previous.x + self.previous.width + space
+            space = _measure_word(self.previous.font, " ")
+            x = self.previous.x + self.previous.width + space
+        else:
+            x = getattr(self.parent, 'x', 0)
+        self.layout_at(x)
+
+    def layout_at(self, x) -> None:
+        self.x = x
+        # Use the font resolved once per node during the style pass;
+        # fall back to resolving it here when the cache is absent.
+        cached = getattr(self.node, "_font", None)
+        if cached is not None:
+            self.font = cached
+            linespace = self.node._linespace
         else:
-            self.x = getattr(self.parent, 'x', 0)
-        self.height = self.font.metrics("linespace")
+            self.font, linespace = _resolve_font(
+                self.node.style.get("font-size", "16px"),
+                self.node.style.get("font-weight", "normal"),
+                self.node.style.get("font-style", "normal"))
+        self.width = _measure_word(self.font, self.word)
+        self.height = linespace
 
         # If this text node is an anchor (<a href="...">), register its
         # bounding box for click detection. The rect covers the full
@@ -1373,7 +2058,7 @@ class TextLayout:
         return [DrawText(self.x, self.y, self.word, self.font, color)]
 
     def should_paint(self) -> bool:
-        return True
+        return self._visible
 
 class InputLayout:
     """
@@ -1383,6 +2068,8 @@ class InputLayout:
     support hidden inputs and password masking as described in
     Chapter 10 exercises.
     """
+    __slots__ = ("node", "parent", "previous", "children",
+                 "x", "y", "width", "height", "font", "_visible")
     def __init__(self, node, parent, previous):
         self.node = node
         self.parent = parent
@@ -1393,22 +2080,33 @@ class InputLayout:
         self.width = 0
         self.height = 0
         self.font = None
+        self._visible = True
 
     def layout(self) -> None:
-        # Font for input or button
-        weight = self.node.style.get("font-weight", "normal")
-        style = self.node.style.get("font-style", "normal")
-        if style == "normal":
-            style = "roman"
-        size_str = self.node.style.get("font-size", "16px")
-        try:
-            px = float(size_str[:-2])
-        except Exception:
-            px = 16.0
-        size = int(px * 0.75)
-        self.font = get_font(size, weight, style)
+        # Legacy previous-chain entry point; LineLayout.layout calls
+        # layout_at with a running cursor instead.
+        if self.previous:
+            space = _measure_word(self.previous.font, " ")
+            x = self.previous.x + self.previous.width + space
+        else:
+            x = getattr(self.parent, 'x', 0)
+        self.layout_at(x)
+
+    def layout_at(self, x) -> None:
+        self.x = x
+        # Font for input or button; prefer the style-pass cache
+        cached = getattr(self.node, "_font", None)
+        if cached is not None:
+            self.font = cached
+            linespace = self.node._linespace
+        else:
+            self.font, linespace = _resolve_font(
+                self.node.style.get("font-size", "16px"),
+                self.node.style.get("font-weight", "normal"),
+                self.node.style.get("font-style", "normal"))
         # Determine the type of input (text, hidden, password, checkbox, etc.)
         itype = self.node.attributes.get("type", "text").lower() if self.node.tag == "input" else None
+        self._visible = itype != "hidden"
         # Width: hidden inputs have no width or height
         if itype == "hidden":
             self.width = 0
@@ -1422,22 +2120,15 @@ class InputLayout:
             text = ""
             if len(self.node.children) == 1 and isinstance(self.node.children[0], Text):
                 text = self.node.children[0].text
-            self.width = max(80, self.font.measure(text) + 20)
-        # Horizontal position: after previous inline object with a space
-        if self.previous:
-            space = self.previous.font.measure(" ")
-            self.x = self.previous.x + self.previous.width + space
-        else:
-            self.x = getattr(self.parent, 'x', 0)
+            self.width = max(80, _measure_word(self.font, text) + 20)
         # Height based on font
-        self.height = self.font.metrics("linespace")
+        self.height = linespace
 
     def should_paint(self) -> bool:
-        # Hidden inputs take no space and are not painted
-        if self.node.tag == "input":
-            itype = self.node.attributes.get("type", "text").lower()
-            return itype != "hidden"
-        return True
+        # Hidden inputs take no space and are not painted; the flag is
+        # computed during layout so paint-time callers read a slot
+        # instead of re-checking attributes.
+        return self._visible
 
     def paint(self) -> list:
         cmds: list = []
@@ -1460,7 +2151,7 @@ class InputLayout:
             raw = self.node.attributes.get("value", "")
             itype = self.node.attributes.get("type", "text").lower()
             if itype == "password":
-                text_value = "".join("•" for _ in raw)
+                text_value = "•" * len(raw)
             else:
                 text_value = raw
         else:
@@ -1478,21 +2169,30 @@ class InputLayout:
 
 # ================= Draw commands + geometry shims =================
 class Rect:
+    __slots__ = ("left", "top", "right", "bottom")
     def __init__(self, left, top, right, bottom):
         self.left, self.top, self.right, self.bottom = left, top, right, bottom
     def contains_point(self, x, y):
         return self.left <= x <= self.right and self.top <= y <= self.bottom
 
 class DrawText:
+    __slots__ = ("top", "left", "bottom", "text", "font", "color")
     def __init__(self, x1, y1, text, font, color):
         self.top = y1; self.left = x1
         self.text = text; self.font = font; self.color = color
+        # Vertical extent for viewport culling; fall back to a rough
+        # line height when the font can't report metrics.
+        try:
+            self.bottom = y1 + font_metrics(font)[2]
+        except Exception:
+            self.bottom = y1 + 20
     def execute(self, scroll, canvas):
         canvas.create_text(self.left, self.top - scroll,
                            text=self.text, font=self.font,
                            fill=self.color, anchor='nw')
 
 class DrawRect:
+    __slots__ = ("top", "left", "bottom", "right", "color")
     def __init__(self, x1, y1, x2, y2, color):
         self.top = y1; self.left = x1
         self.bottom = y2; self.right = x2
@@ -1503,16 +2203,20 @@ class DrawRect:
                                 width=0, fill=self.color)
 
 class DrawLine:
+    __slots__ = ("x1", "y1", "x2", "y2", "top", "bottom", "color", "thickness")
     def __init__(self, x1, y1, x2, y2, color, thickness=1):
         self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.top = min(y1, y2); self.bottom = max(y1, y2)
         self.color = color; self.thickness = thickness
     def execute(self, scroll, canvas):
         canvas.create_line(self.x1, self.y1 - scroll, self.x2, self.y2 - scroll,
                            fill=self.color, width=self.thickness)
 
 class DrawOutline:
+    __slots__ = ("x1", "y1", "x2", "y2", "top", "bottom", "color", "thickness")
     def __init__(self, x1, y1, x2, y2, color, thickness=1):
         self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.top = y1; self.bottom = y2
         self.color = color; self.thickness = thickness
     def execute(self, scroll, canvas):
         canvas.create_rectangle(self.x1, self.y1 - scroll, self.x2, self.y2 - scroll,
@@ -1528,6 +2232,7 @@ class DrawImage:
     def __init__(self, rect, image, quality):
         # rect is (x1, y1, x2, y2)
         self.rect = rect
+        self.top = rect[1]; self.bottom = rect[3]
         self.image = image
         self.quality = quality
     def execute(self, scroll, canvas):
@@ -1563,6 +2268,47 @@ class DrawImage:
             except Exception:
                 pass
 
+# PIL fonts matching Tk fonts, cached by (size, weight, slant). Only
+# used by the Pillow raster path; load_default is the fallback when no
+# scalable face is available.
+_PIL_FONT_CACHE: dict = {}
+
+def _pil_font(tk_font):
+    size, weight, slant = 12, "normal", "roman"
+    try:
+        if hasattr(tk_font, "actual"):
+            a = tk_font.actual()
+            size = abs(int(a.get("size", 12))) or 12
+            weight = a.get("weight", "normal")
+            slant = a.get("slant", "roman")
+        elif isinstance(tk_font, tuple) and len(tk_font) >= 2:
+            size = abs(int(tk_font[1])) or 12
+            if len(tk_font) >= 3:
+                weight = str(tk_font[2])
+    except Exception:
+        pass
+    key = (size, weight, slant)
+    font = _PIL_FONT_CACHE.get(key)
+    if font is None:
+        bold = weight == "bold"
+        italic = slant == "italic"
+        name = "DejaVuSans"
+        if bold and italic:
+            name += "-BoldOblique"
+        elif bold:
+            name += "-Bold"
+        elif italic:
+            name += "-Oblique"
+        try:
+            font = PILImageFont.truetype(name + ".ttf", size)
+        except Exception:
+            try:
+                font = PILImageFont.load_default()
+            except Exception:
+                font = None
+        _PIL_FONT_CACHE[key] = font
+    return font
+
 # ================= JavaScript runtime & context =================
 # The following strings define a minimal DOM-like API implemented in
 # JavaScript. They expose methods used by exercises in Chapter 9
@@ -1820,6 +2566,29 @@ class DrawRRect:
         canvas.create_arc(x2-2*r, y1, x2, y1+2*r, start=0,  extent=90, outline=self.color, fill=self.color)
         canvas.create_arc(x2-2*r, y2-2*r, x2, y2, start=270, extent=90, outline=self.color, fill=self.color)
         canvas.create_arc(x1, y2-2*r, x1+2*r, y2, start=180, extent=90, outline=self.color, fill=self.color)
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector_text: str):
+    """Parse a querySelectorAll selector once; scripts tend to query the
+    same handful of selectors in loops."""
+    return CSSParser(selector_text).selector()
+
+@functools.lru_cache(maxsize=64)
+def _parse_fragment(s: str):
+    """Parse an innerHTML fragment into template nodes. Scripts often
+    re-assign the same markup string, so the parse is cached and each
+    assignment clones the templates instead of re-running the parser."""
+    return tuple(HTMLParser("<body>" + s + "</body>").parse().children)
+
+def _clone_node(node, parent):
+    """Deep-copy a template subtree so cached fragments never share
+    mutable nodes with the live DOM."""
+    if isinstance(node, Text):
+        return Text(node.text, parent)
+    new = Element(node.tag, dict(node.attributes), parent)
+    new.children = [_clone_node(c, new) for c in node.children]
+    return new
+
 class JSContext:
     """
     A JavaScript execution context based on DukPy. It provides a
@@ -1833,8 +2602,11 @@ class JSContext:
         if dukpy is None:
             raise RuntimeError("DukPy is required for JavaScript support")
         self.interp = dukpy.JSInterpreter()
-        # Mapping between Python nodes and JS handles
-        self.node_to_handle: dict[object, int] = {}
+        # Mapping between Python nodes and JS handles. Keys are id(node)
+        # so lookups never depend on Element growing __eq__/__hash__;
+        # handle_to_node keeps a strong reference to every keyed node,
+        # so a collected node's id can't be reused while mapped.
+        self.node_to_handle: dict[int, int] = {}
         self.handle_to_node: dict[int, object] = {}
         # Export Python functions
         self.interp.export_function("querySelectorAll", self.querySelectorAll)
@@ -1860,28 +2632,71 @@ class JSContext:
         self.interp.export_function("requestAnimationFrame", self.requestAnimationFrame)
         # Whether this context has been discarded (e.g., page navigated away)
         self.discarded = False
+        # Coalesced-render bookkeeping: DOM mutation exports mark these
+        # instead of re-styling inline, and _flush_render runs the
+        # style/layout pass once when the interpreter returns to Python.
+        self._render_dirty = False
+        self._style_dirty = False
+        self._ids_dirty = False
+        # Serialization epoch: bumped on any DOM mutation so cached
+        # innerHTML/outerHTML strings invalidate in O(1) per write
+        # instead of walking parent chains clearing caches.
+        self._dom_version = 0
+        # The page origin is fixed for this context's lifetime (a new
+        # JSContext is built on every navigation), so resolve it once
+        # for the XHR and cookie paths.
+        try:
+            self._tab_origin = tab.url.origin() if tab.url else None
+        except Exception:
+            self._tab_origin = None
         # Load runtime script
         self.interp.evaljs(RUNTIME_JS)
         # Track id variables defined in JS
         self.id_vars: list[str] = []
 
+    def _schedule_render(self) -> None:
+        """Defer the style+layout pass until the current script returns.
+        A script that builds a subtree with N appendChild calls should
+        pay for one pass, not N."""
+        self._render_dirty = True
+
+    def _flush_render(self) -> None:
+        """Run the coalesced style/layout and id-variable updates queued
+        by the mutation exports since the interpreter was entered."""
+        if self._render_dirty:
+            self._render_dirty = False
+            self._style_dirty = False
+            self.tab.process_scripts_and_styles()
+            self.tab.apply_styles_and_render()
+        elif self._style_dirty:
+            # Selector matches or inline style changed, but no new
+            # scripts or stylesheets: re-run the cascade without the
+            # subresource reparse pass.
+            self._style_dirty = False
+            self.tab.apply_styles_and_render()
+        if self._ids_dirty:
+            self._ids_dirty = False
+            self.update_ids()
+
     # ----- handle management -----
     def get_handle(self, elt) -> int:
         """Return a stable handle for a Python node, creating one if needed."""
-        if elt not in self.node_to_handle:
+        k = id(elt)
+        h = self.node_to_handle.get(k)
+        if h is None:
             h = len(self.node_to_handle)
-            self.node_to_handle[elt] = h
+            self.node_to_handle[k] = h
             self.handle_to_node[h] = elt
-        return self.node_to_handle[elt]
+        return h
 
     # ----- exported functions -----
     def querySelectorAll(self, selector_text: str) -> list[int]:
         # Return handles for all nodes matching a CSS selector.
         try:
-            selector = CSSParser(selector_text).selector()
+            selector = _compile_selector(selector_text)
         except Exception:
             return []
-        nodes = [n for n in tree_to_list(self.tab.nodes, []) if selector.matches(n)]
+        nodes = [n for n in self.tab.get_tree_list() if selector.matches(n)]
         return [self.get_handle(n) for n in nodes]
 
     def getAttribute(self, handle: int, attr: str) -> str:
@@ -1900,36 +2715,62 @@ class JSContext:
                 del node.attributes[attr]
         else:
             node.attributes[attr] = value
+        self._dom_version += 1
+        # id/class changes alter what the flat-list consumers see
+        if attr in ("id", "class"):
+            self.tab.invalidate_tree_list()
         # Update id variables if id changed
         if attr == "id":
-            self.update_ids()
-        # Re-style and re-render because attributes may change styling
-        # For script/link src changes, process scripts and styles
-        self.tab.process_scripts_and_styles()
-        # Recompute style rules and layout
-        self.tab.apply_styles_and_render()
+            self._ids_dirty = True
+        # Only attributes that can introduce a stylesheet or script need
+        # the full reparse pass. Attributes that change what the cascade
+        # computes (selector matches via class/id, inline style) need
+        # style() re-run — Tab.render alone only re-lays-out against the
+        # stale computed styles. Everything else (value, data-*, title,
+        # ...) just needs layout+paint.
+        if attr in ("src", "href", "rel", "type") and \
+                getattr(node, "tag", None) in ("script", "link", "style"):
+            # The subresource index keys off these attributes too
+            self.tab.invalidate_tree_list()
+            self._schedule_render()
+        elif attr in ("class", "id", "style"):
+            self._style_dirty = True
+            self.tab.set_needs_render()
+        else:
+            self.tab.set_needs_render()
 
     def innerHTML_set(self, handle: int, s: str) -> None:
         # Replace children of node with new HTML
         node = self.handle_to_node.get(handle)
         if not isinstance(node, Element):
             return
-        # Parse the new HTML; wrap in a dummy element to parse children
+        s = "" if s is None else str(s)
+        # Clearing (element.innerHTML = "") is common enough to skip the
+        # parser entirely
+        if not s or s.isspace():
+            for c in node.children:
+                c.parent = None
+            node.children = []
+            self.tab.invalidate_tree_list()
+            self._dom_version += 1
+            self._schedule_render()
+            self._ids_dirty = True
+            return
+        # Parse (or fetch the cached templates for) the new HTML and
+        # clone them under this node
         try:
-            parsed = HTMLParser("<body>" + s + "</body>").parse()
+            templates = _parse_fragment(s)
         except Exception:
             return
-        new_children = parsed.children  # children under body
-        # Detach existing children
-        node.children = []
-        for c in new_children:
-            c.parent = node
-        node.children = new_children
-        # Update stylesheets and scripts; restyle and render
-        self.tab.process_scripts_and_styles()
-        self.tab.apply_styles_and_render()
-        # Update id variables
-        self.update_ids()
+        for c in node.children:
+            c.parent = None
+        node.children = [_clone_node(c, node) for c in templates]
+        self.tab.invalidate_tree_list()
+        self._dom_version += 1
+        # Stylesheet/script processing, restyle and id updates are
+        # coalesced until the script returns
+        self._schedule_render()
+        self._ids_dirty = True
 
     def innerHTML_get(self, handle: int) -> str:
         node = self.handle_to_node.get(handle)
@@ -1947,10 +2788,16 @@ class JSContext:
         return self._serialize(node)
 
     def _serialize(self, node) -> str:
-        # Convert a node subtree back into HTML
+        # Convert a node subtree back into HTML. Element results are
+        # cached against the serialization epoch: scripts often read
+        # innerHTML/outerHTML repeatedly between mutations, and a hit
+        # returns the stored string instead of rebuilding the subtree.
         if isinstance(node, Text):
             return node.text
         if isinstance(node, Element):
+            cached = getattr(node, "_serial", None)
+            if cached is not None and cached[0] == self._dom_version:
+                return cached[1]
             attrs = []
             for k, v in node.attributes.items():
                 if v == "":
@@ -1963,12 +2810,15 @@ class JSContext:
             attr_str = (" " + " ".join(attrs)) if attrs else ""
             # Self-closing tags
             if node.tag in HTMLParser.SELF_CLOSING_TAGS:
-                return f"<{node.tag}{attr_str}>"
-            inner = []
-            for c in node.children:
-                inner.append(self._serialize(c))
-            inner_str = "".join(inner)
-            return f"<{node.tag}{attr_str}>" + inner_str + f"</{node.tag}>"
+                out = f"<{node.tag}{attr_str}>"
+            else:
+                inner = []
+                for c in node.children:
+                    inner.append(self._serialize(c))
+                inner_str = "".join(inner)
+                out = f"<{node.tag}{attr_str}>" + inner_str + f"</{node.tag}>"
+            node._serial = (self._dom_version, out)
+            return out
         return ""
 
     def children(self, handle: int) -> list[int]:
@@ -1981,30 +2831,48 @@ class JSContext:
         return out
 
     def create_element(self, tag: str) -> int:
-        # Create a detached Element. It will be inserted later.
-        new_node = Element(tag, {}, None)
+        # Create a detached Element. It will be inserted later. Intern
+        # the tag so script-created nodes share the identity fast path
+        # with parser-created ones.
+        new_node = Element(sys.intern(tag), {}, None)
         # Default style based on inheritance (will be updated when inserted)
         new_node.style = {k: v for k, v in INHERITED_PROPERTIES.items()}
         return self.get_handle(new_node)
 
+    def _detach(self, child) -> None:
+        """Remove child from its current parent's child list. Uses the
+        tracked _index for an O(1) pop when it still points at the
+        child; a stale index (siblings shifted since) falls back to the
+        O(N) remove."""
+        old = getattr(child, "parent", None)
+        if old is None:
+            return
+        kids = getattr(old, "children", None)
+        if kids is None:
+            return
+        idx = getattr(child, "_index", -1)
+        if 0 <= idx < len(kids) and kids[idx] is child:
+            kids.pop(idx)
+        else:
+            try:
+                kids.remove(child)
+            except ValueError:
+                pass
+        child._index = -1
+
     def append_child(self, parent_handle: int, child_handle: int) -> None:
         parent = self.handle_to_node.get(parent_handle)
         child = self.handle_to_node.get(child_handle)
         if not (isinstance(parent, Element) and child):
             return
-        # Detach child from old parent if present
-        if hasattr(child, "parent") and child.parent is not None:
-            try:
-                child.parent.children.remove(child)
-            except ValueError:
-                pass
+        self._detach(child)
         child.parent = parent
+        child._index = len(parent.children)
         parent.children.append(child)
-        # Process potential scripts/styles and restyle DOM
-        self.tab.process_scripts_and_styles()
-        self.tab.apply_styles_and_render()
-        # Update id variables
-        self.update_ids()
+        self.tab.invalidate_tree_list()
+        self._dom_version += 1
+        self._schedule_render()
+        self._ids_dirty = True
 
     def insert_before(self, parent_handle: int, child_handle: int, ref_handle: int) -> None:
         parent = self.handle_to_node.get(parent_handle)
@@ -2012,38 +2880,36 @@ class JSContext:
         ref = self.handle_to_node.get(ref_handle)
         if not (isinstance(parent, Element) and child and ref):
             return
-        # Detach child from old parent if present
-        if hasattr(child, "parent") and child.parent is not None:
-            try:
-                child.parent.children.remove(child)
-            except ValueError:
-                pass
+        self._detach(child)
         child.parent = parent
         try:
             idx = parent.children.index(ref)
         except ValueError:
+            child._index = len(parent.children)
             parent.children.append(child)
         else:
+            # Later siblings' _index goes stale here; _detach verifies
+            # identity before popping, so stale indices are harmless.
+            child._index = idx
             parent.children.insert(idx, child)
-        # Update
-        self.tab.process_scripts_and_styles()
-        self.tab.apply_styles_and_render()
-        self.update_ids()
+        self.tab.invalidate_tree_list()
+        self._dom_version += 1
+        self._schedule_render()
+        self._ids_dirty = True
 
     def remove_child(self, parent_handle: int, child_handle: int) -> None:
         parent = self.handle_to_node.get(parent_handle)
         child = self.handle_to_node.get(child_handle)
         if not (isinstance(parent, Element) and child):
             return
-        try:
-            parent.children.remove(child)
-        except ValueError:
+        if getattr(child, "parent", None) is not parent:
             return
+        self._detach(child)
         child.parent = None
-        # Remove any style sheets associated with removed subtree
-        self.tab.process_scripts_and_styles()
-        self.tab.apply_styles_and_render()
-        self.update_ids()
+        self.tab.invalidate_tree_list()
+        self._dom_version += 1
+        self._schedule_render()
+        self._ids_dirty = True
 
     def getParent(self, handle: int) -> int:
         node = self.handle_to_node.get(handle)
@@ -2064,7 +2930,7 @@ class JSContext:
                 pass
         self.id_vars = []
         # Recreate variables for current elements
-        nodes = tree_to_list(self.tab.nodes, []) if self.tab.nodes else []
+        nodes = self.tab.get_tree_list()
         for node in nodes:
             if isinstance(node, Element) and "id" in node.attributes:
                 varname = node.attributes["id"]
@@ -2094,12 +2960,13 @@ class JSContext:
         except Exception as ex:
             # Ignore script errors to avoid crashing the browser
             print("JS error:", ex)
+        self._flush_render()
 
 
     def dispatch_event(self, type: str, elt) -> bool:
         """Dispatch an event of the given type on the given element.
         Returns True if the default action should be skipped (prevented)."""
-        handle = self.node_to_handle.get(elt)
+        handle = self.node_to_handle.get(id(elt))
         if handle is None:
             return False
         try:
@@ -2107,6 +2974,8 @@ class JSContext:
             do_default = self.interp.evaljs(EVENT_DISPATCH_JS, type=type, handle=handle)
         except Exception:
             return False
+        finally:
+            self._flush_render()
         return not bool(do_default)
 
     # ----- XMLHttpRequest API -----
@@ -2140,13 +3009,13 @@ class JSContext:
             # Perform the request; include referer and origin headers
             try:
                 ref = str(self.tab.url) if self.tab.url else None
-                origin = self.tab.url.origin() if self.tab.url else None
-                headers, out = full_url.request(referrer=ref, payload=body, origin=origin)
+                headers, out = full_url.request(referrer=ref, payload=body,
+                                                origin=self._tab_origin)
             except Exception as ex:
                 # Propagate network errors to JavaScript by re-raising
                 raise Exception(str(ex))
             # Enforce same-origin policy unless CORS allows
-            req_origin = self.tab.url.origin() if self.tab.url else None
+            req_origin = self._tab_origin
             resp_origin = full_url.origin()
             if req_origin is not None and resp_origin != req_origin:
                 # Look for Access-Control-Allow-Origin header
@@ -2208,6 +3077,7 @@ class JSContext:
             self.interp.evaljs(XHR_ONLOAD_JS, out=body, handle=handle)
         except Exception:
             pass
+        self._flush_render()
 
     # ----- Cookie API for document.cookie -----
     def get_cookie(self) -> str:
@@ -2217,11 +3087,17 @@ class JSContext:
         same format as the Cookie header, separated by '; '. Cookies marked
         HttpOnly are not returned to JavaScript. Expired cookies are removed.
         """
-        try:
-            origin = self.tab.url.origin()
-        except Exception:
+        origin = self._tab_origin
+        if origin is None:
             return ""
         now = time.time()
+        # Fast path: the jar hasn't changed and nothing has expired
+        # since the string was last assembled.
+        ver = JAR_VERSION.get(origin, 0)
+        cached = _COOKIE_STR_CACHE.get(origin)
+        if cached is not None and cached[0] == ver and \
+                now < NEXT_EXPIRY.get(origin, math.inf):
+            return cached[1]
         cookies = []
         jar = COOKIE_JAR.get(origin, {})
         # Remove expired cookies and build the cookie string
@@ -2230,22 +3106,11 @@ class JSContext:
             # Skip HttpOnly cookies when reading
             if any(k.lower() == 'httponly' for k in params):
                 continue
-            # Check expiration
-            exp = params.get('expires')
-            if exp:
-                try:
-                    # If expiration stored as timestamp
-                    if isinstance(exp, (int, float)):
-                        expires_ts = float(exp)
-                    else:
-                        # Parse RFC 1123 date string
-                        dt = email.utils.parsedate_to_datetime(str(exp))
-                        expires_ts = dt.timestamp()
-                except Exception:
-                    expires_ts = None
-                if expires_ts is not None and now > expires_ts:
-                    expired.append(name)
-                    continue
+            # Check expiration (handles float timestamps and RFC 1123
+            # strings; unparseable dates count as non-expiring)
+            if now > _cookie_expiry(params):
+                expired.append(name)
+                continue
             # Build cookie string: name=value plus parameters
             parts = [f"{name}={val}"]
             for k, v in params.items():
@@ -2260,7 +3125,11 @@ class JSContext:
         # Remove expired cookies from jar
         for name in expired:
             jar.pop(name, None)
-        return "; ".join(cookies)
+        if expired:
+            JAR_VERSION[origin] = JAR_VERSION.get(origin, 0) + 1
+        out = "; ".join(cookies)
+        _COOKIE_STR_CACHE[origin] = (JAR_VERSION.get(origin, 0), out)
+        return out
 
     def set_cookie(self, cookie_str: str) -> None:
         """
@@ -2271,44 +3140,42 @@ class JSContext:
         be sent on same-site requests and cross-site GET requests but not on
         cross-site POSTs. Secure and other attributes are stored but not used.
         """
-        try:
-            origin = self.tab.url.origin()
-        except Exception:
+        origin = self._tab_origin
+        if origin is None:
             return
-        cookie_str = str(cookie_str).strip()
-        if not cookie_str:
+        cs = cookie_str if isinstance(cookie_str, str) else str(cookie_str)
+        # Shortest settable cookie is "a=b"; probes and empty strings
+        # bail before any allocation.
+        if len(cs) < 3:
             return
-        # Split on ';' to parse name=value and parameters
-        parts = [p.strip() for p in cookie_str.split(';')]
-        if not parts:
+        i = cs.find('=')
+        j = cs.find(';')
+        if i <= 0 or (j != -1 and j < i):
             return
-        first = parts[0]
-        if '=' not in first:
+        name = cs[:i].strip()
+        if not name:
             return
-        name, val = first.split('=', 1)
+        val = (cs[i + 1:] if j == -1 else cs[i + 1:j]).strip()
+        # Walk the attributes with find() instead of building a split
+        # list: trackers set lots of short cookies and most have no
+        # attributes at all.
         params: dict[str, str] = {}
-        for part in parts[1:]:
-            if not part:
-                continue
-            if '=' in part:
-                k, v = part.split('=', 1)
-                params[k.casefold()] = v
-            else:
-                params[part.casefold()] = ""
+        while j != -1:
+            k = cs.find(';', j + 1)
+            part = (cs[j + 1:] if k == -1 else cs[j + 1:k]).strip()
+            if part:
+                eq = part.find('=')
+                if eq == -1:
+                    params[sys.intern(part.casefold())] = ""
+                else:
+                    params[sys.intern(part[:eq].casefold())] = part[eq + 1:]
+            j = k
         # If attempting to set an HttpOnly cookie via JS, ignore
-        if any(k.lower() == 'httponly' for k in params):
+        if 'httponly' in params:
             return
-        # Parse Expires into timestamp if provided
-        exp = params.get('expires')
-        if exp:
-            try:
-                dt = email.utils.parsedate_to_datetime(str(exp))
-                params['expires'] = dt.timestamp()
-            except Exception:
-                # Leave as string if parsing fails
-                pass
-        # Store in cookie jar
-        COOKIE_JAR.setdefault(origin, {})[name] = (val, params)
+        # Store in cookie jar (normalizes Expires/SameSite and updates
+        # NEXT_EXPIRY)
+        _store_cookie(origin, name, val, params)
 
     # ----- style attribute support -----
     def style_set(self, handle: int, s: str) -> None:
@@ -2321,6 +3188,10 @@ class JSContext:
         if isinstance(node, Element):
             # Update the style attribute (inline style)
             node.attributes["style"] = s
+            self._dom_version += 1
+            # Inline style feeds the cascade, so queue a restyle, not
+            # just a re-layout
+            self._style_dirty = True
             # Notify the tab that rendering is needed
             if hasattr(self.tab, "set_needs_render"):
                 self.tab.set_needs_render()
@@ -2339,6 +3210,7 @@ class JSContext:
             self.interp.evaljs(SETTIMEOUT_JS, handle=handle)
         except Exception:
             pass
+        self._flush_render()
 
     def setTimeout(self, handle: int, time_ms: int) -> None:
         """
@@ -2380,12 +3252,23 @@ class JSContext:
             pass
 
 def paint_tree(layout_object, display_list):
-    if hasattr(layout_object, "should_paint") and not layout_object.should_paint():
-        pass
-    else:
-        display_list.extend(layout_object.paint())
-    for child in layout_object.children:
-        paint_tree(child, display_list)
+    # Iterative preorder: no Python frame per layout node and no
+    # recursion limit on pathologically deep documents. should_paint()
+    # stays memoized on the node because Browser.build_display_list
+    # walks the same tree and the predicate can't change within a frame
+    # (layout() resets the memo).
+    stack = [layout_object]
+    extend = display_list.extend
+    while stack:
+        obj = stack.pop()
+        v = getattr(obj, "_paint_visible", None)
+        if v is None:
+            v = obj._paint_visible = obj.should_paint()
+        if v:
+            extend(obj.paint())
+        kids = obj.children
+        if kids:
+            stack.extend(reversed(kids))
 
 # ================= Tab abstraction =================
 class Tab:
@@ -2394,6 +3277,16 @@ class Tab:
         self.history = []            # list of dicts: {url, method, body}
         self.history_index = -1
         self.nodes = None
+        # Flat document-order list of the DOM, cached because the JS DOM
+        # helpers and focus/style passes re-walk the whole tree on every
+        # call. Structural mutations invalidate it via
+        # invalidate_tree_list().
+        self._tree_list = None
+        self._tree_version = 0
+        # Derived index of <script src>/<link rel=stylesheet> elements,
+        # rebuilt lazily when the tree version moves.
+        self._subres_nodes = None
+        self._subres_version = -1
         self.document = None
         self.display_list = []
         self.scroll = 0
@@ -2405,6 +3298,11 @@ class Tab:
         self.loaded_scripts: set[str] = set()
         self.loaded_styles: dict[object, list] = {}
         self.extra_style_rules: list[tuple[object, dict[str, str]]] = []
+        # Merged, cascade-sorted rule list reused across rerenders; it
+        # only changes when process_scripts_and_styles swaps
+        # extra_style_rules (tracked by identity of the source list).
+        self._cached_rules: list | None = None
+        self._cached_rules_src: list | None = None
         self.allowed_origins: set[str] | None = None  # CSP allowed origins
         self.referrer_policy: str | None = None
         # Track certificate errors on last request. True if the last HTTPS
@@ -2459,6 +3357,34 @@ class Tab:
             # 8-5: Do not re-POST on reload; reload with GET
             self.load(entry["url"], payload=None)
 
+    def get_tree_list(self) -> list:
+        """Return the cached flat list of DOM nodes in document order,
+        recomputing it only after a structural mutation."""
+        if self._tree_list is None:
+            self._tree_list = tree_to_list(self.nodes, []) if self.nodes else []
+        return self._tree_list
+
+    def get_subresource_nodes(self) -> list:
+        """<script src> and stylesheet <link> elements in document
+        order. Derived from the flat list and keyed to its version, so
+        repeated scans skip the thousands of unrelated nodes on
+        content-heavy pages."""
+        if self._subres_nodes is None or \
+                self._subres_version != self._tree_version:
+            self._subres_nodes = [
+                n for n in self.get_tree_list()
+                if isinstance(n, Element) and
+                ((n.tag == "script" and "src" in n.attributes) or
+                 (n.tag == "link" and
+                  n.attributes.get("rel", "").casefold() == "stylesheet" and
+                  "href" in n.attributes))]
+            self._subres_version = self._tree_version
+        return self._subres_nodes
+
+    def invalidate_tree_list(self) -> None:
+        self._tree_list = None
+        self._tree_version += 1
+
     def set_needs_render(self) -> None:
         """
         Mark that this tab needs to be re-rendered. Setting this flag
@@ -2545,7 +3471,9 @@ class Tab:
                     item = item.strip().rstrip(";")
                     if item:
                         allowed.add(item)
-                self.allowed_origins = allowed if allowed else None
+                # Frozen once per navigation; allowed_request does a hash
+                # lookup per subresource so set semantics matter here.
+                self.allowed_origins = frozenset(allowed) if allowed else None
             except ValueError:
                 self.allowed_origins = None
         else:
@@ -2559,6 +3487,7 @@ class Tab:
         self.referrer_policy = rp.strip().lower() if rp else None
         # Parse HTML document
         self.nodes = HTMLParser(body).parse()
+        self.invalidate_tree_list()
         self.title = self._extract_title() or f"{url.host}"
 
         # Reset zoom and adopt current browser dark mode when navigating
@@ -2574,7 +3503,7 @@ class Tab:
         # Before processing scripts and styles, load images for all <img> tags.
         try:
             # Iterate over all img elements in the DOM and download images
-            imgs = [n for n in tree_to_list(self.nodes, []) if isinstance(n, Element) and n.tag == "img"]
+            imgs = [n for n in self.get_tree_list() if isinstance(n, Element) and n.tag == "img"]
             for img in imgs:
                 src = img.attributes.get("src", "")
                 if not src:
@@ -2682,8 +3611,9 @@ class Tab:
                 self.js.interp.evaljs("__runRAFHandlers()")
             except Exception:
                 pass
-        # Clear widget hit-test boxes
-        Browser._clear_widget_boxes()
+            self.js._flush_render()
+        # New hit-test generation; boxes re-register during layout below
+        Browser._new_widget_box_frame()
         # Layout and paint
         # When dark mode is active, flip the default text color. The
         # INHERITED_PROPERTIES dictionary determines the base values
@@ -2697,7 +3627,12 @@ class Tab:
                 INHERITED_PROPERTIES["color"] = "black"
         except Exception:
             pass
-        self.document = DocumentLayout(self.nodes)
+        # Keep the layout tree across renders for the same DOM root:
+        # DocumentLayout.layout recycles clean BlockLayout rows instead
+        # of reallocating the whole tree every frame.
+        if not (getattr(self, 'document', None) and
+                self.document.node is self.nodes):
+            self.document = DocumentLayout(self.nodes)
         # Use current zoom when laying out the document. DocumentLayout
         # stores the zoom factor and applies it to paddings and widths.
         try:
@@ -2707,6 +3642,21 @@ class Tab:
             self.document.layout()
         self.display_list = []
         paint_tree(self.document, self.display_list)
+        # Scroll-sorted view of the display list for viewport culling:
+        # a stable sort by top plus the max command height lets draw
+        # paths bisect out everything offscreen in O(log N).
+        try:
+            dl_sorted = sorted(self.display_list, key=lambda c: c.top)
+            self._dl_sorted = dl_sorted
+            self._dl_tops = [c.top for c in dl_sorted]
+            self._dl_maxh = max(
+                (c.bottom - c.top for c in dl_sorted), default=0)
+            self._dl_src = self.display_list
+        except Exception:
+            self._dl_src = None
+        # Layout tree changed: drop the memoized paint collection so the
+        # next build_display_list re-walks the fresh tree.
+        self._paint_cache = None
         self.doc_height = self.document.height
         # Clamp scroll offset to content height
         self.scroll = min(self.scroll, max(0, self.doc_height - HEIGHT))
@@ -2723,19 +3673,24 @@ class Tab:
             pass
 
     def _extract_title(self):
-        def walk(n):
-            if isinstance(n, Element) and n.tag == "title":
-                buf = []
-                def collect(t):
-                    if isinstance(t, Text): buf.append(t.text.strip())
-                    for c in t.children: collect(c)
-                collect(n)
-                return " ".join(x for x in buf if x)
-            for c in n.children:
-                r = walk(c)
-                if r: return r
+        # Iterative BFS that stops at the first <title> and never
+        # descends into <body> (titles only live in <head>). This keeps
+        # title extraction O(head size) on large documents and avoids
+        # allocating nested closures per call.
+        if not self.nodes:
             return None
-        return walk(self.nodes) if self.nodes else None
+        dq = deque([self.nodes])
+        while dq:
+            n = dq.popleft()
+            if isinstance(n, Element):
+                if n.tag == "body":
+                    continue
+                if n.tag == "title":
+                    return " ".join(
+                        t.text.strip() for t in tree_to_list(n, [])
+                        if isinstance(t, Text) and t.text.strip())
+            dq.extend(n.children)
+        return None
 
     def clamp_scroll(self):
         self.scroll = max(0, min(self.scroll, max(0, self.doc_height - HEIGHT)))
@@ -2761,7 +3716,8 @@ class Tab:
         self.blur()
 
         if elt is not None:
-            # Dispatch click event to JS; if prevented, return
+            # Dispatch click event to JS; if prevented, mark dirty and
+            # let the mainloop flush one render.
             if self.js:
                 try:
                     prevent = self.js.dispatch_event("click", elt)
@@ -2769,7 +3725,7 @@ class Tab:
                     prevent = False
                 if prevent:
                     # JS cancelled default
-                    self.apply_styles_and_render()
+                    self.set_needs_render()
                     return
             # If this element is focusable, set focus on it first
             try:
@@ -2777,7 +3733,9 @@ class Tab:
                     self.focus_element(elt)
             except Exception:
                 pass
-            # Handle input elements: toggle checkboxes or focus text inputs
+            # Handle input elements: toggle checkboxes or focus text inputs.
+            # All state mutations happen first; a single set_needs_render
+            # at the end coalesces them into one render.
             if elt.tag == "input":
                 # checkbox click toggles; text input focuses
                 if elt.attributes.get("type", "text").lower() == "checkbox":
@@ -2789,21 +3747,17 @@ class Tab:
                         elt.attributes["_checked_state"] = "false"
                     else:
                         elt.attributes["_checked_state"] = "true"
-                    # Rerender after toggle
-                    self.apply_styles_and_render()
-                    return
-                # text input focus & clear
-                elt.attributes["value"] = ""
-                # focus already set via focus_element
-                self.apply_styles_and_render()
+                else:
+                    # text input focus & clear
+                    elt.attributes["value"] = ""
+                self.set_needs_render()
                 return
 
             # Handle buttons: find containing form and submit it
             elif elt.tag == "button":
-                form = elt.parent
-                while form and not (isinstance(form, Element) and form.tag == "form"):
-                    form = form.parent
+                form = getattr(elt, "_form_ancestor", None)
                 if form:
+                    # submit_form navigates, which renders on its own
                     self.submit_form(form)
                     return
 
@@ -2812,15 +3766,16 @@ class Tab:
                 try:
                     href = elt.attributes.get("href")
                     if href:
-                        # Resolve the href relative to the current page URL
+                        # Resolve the href relative to the current page URL;
+                        # load() triggers its own render path.
                         dest = self.url.resolve(href)
                         self.load(dest)
                         return
                 except Exception:
                     pass
 
-        # Fall back: re-render the page when clicking non-interactive areas
-        self.apply_styles_and_render()
+        # Fall back: one coalesced render for focus/blur changes
+        self.set_needs_render()
 
     def keypress(self, char):
         if self.focus and isinstance(self.focus, Element) and self.focus.tag == "input":
@@ -2832,19 +3787,17 @@ class Tab:
                 except Exception:
                     prevent = False
             if prevent:
-                self.apply_styles_and_render()
+                self.set_needs_render()
                 return
             if char == "\r" or char == "\n":
                 # 8-1: Enter submits enclosing form
-                form = self.focus.parent
-                while form and not (isinstance(form, Element) and form.tag == "form"):
-                    form = form.parent
+                form = getattr(self.focus, "_form_ancestor", None)
                 if form:
                     self.submit_form(form)
                 return
             # simple text append (backspace etc. omitted for brevity)
             self.focus.attributes["value"] = self.focus.attributes.get("value", "") + char
-            self.apply_styles_and_render()
+            self.set_needs_render()
 
     def allowed_request(self, url: 'URL') -> bool:
         """
@@ -2870,27 +3823,26 @@ class Tab:
             except Exception:
                 prevent = False
         if prevent:
-            self.apply_styles_and_render()
+            self.set_needs_render()
             return
         # Collect inputs
-        inputs = [n for n in tree_to_list(form_elt, [])
-                  if isinstance(n, Element) and n.tag == "input" and "name" in n.attributes]
+        inputs = [n for n in walk_by_tag(form_elt, "input")
+                  if "name" in n.attributes]
 
-        parts = []
+        # Encode all pairs in one urlencode call instead of quoting
+        # name/value per input and joining; unchecked checkboxes are
+        # skipped, checked ones default to value "on".
+        pairs = []
         for inp in inputs:
-            itype = inp.attributes.get("type","text").lower()
+            itype = inp.attributes.get("type", "text").lower()
             if itype == "checkbox":
                 checked = ("checked" in inp.attributes) or (inp.attributes.get("_checked_state") == "true")
                 if not checked:
                     continue  # include only if checked
-                name = urllib.parse.quote(inp.attributes["name"])
-                value = urllib.parse.quote(inp.attributes.get("value","on"))
-                parts.append(f"{name}={value}")
+                pairs.append((inp.attributes["name"], inp.attributes.get("value", "on")))
             else:
-                name = urllib.parse.quote(inp.attributes["name"])
-                value = urllib.parse.quote(inp.attributes.get("value","") )
-                parts.append(f"{name}={value}")
-        body = "&".join(parts)
+                pairs.append((inp.attributes["name"], inp.attributes.get("value", "")))
+        body = urllib.parse.urlencode(pairs, quote_via=urllib.parse.quote)
 
         action = form_elt.attributes.get("action","")
         url = self.url.resolve(action)
@@ -2965,7 +3917,7 @@ class Tab:
         try:
             # Collect focusable nodes in document order
             focusable = []
-            for n in tree_to_list(self.nodes, []):
+            for n in self.get_tree_list():
                 if isinstance(n, Element) and is_focusable(n):
                     focusable.append(n)
             if not focusable:
@@ -3034,6 +3986,21 @@ class Tab:
             pass
 
     # -------- script/style processing --------
+    def _fetch_pool(self) -> 'concurrent.futures.ThreadPoolExecutor':
+        """
+        Return the browser-wide thread pool used for subresource
+        fetches, creating it on first use. Sharing one pool across tabs
+        bounds total connection concurrency.
+        """
+        pool = getattr(self.browser, "_subresource_pool", None)
+        if pool is None:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+            try:
+                self.browser._subresource_pool = pool
+            except Exception:
+                pass
+        return pool
+
     def process_scripts_and_styles(self) -> None:
         """
         Scan the current DOM for <script> and <link rel="stylesheet"> tags.
@@ -3049,83 +4016,142 @@ class Tab:
             return
         # Build a new mapping of link elements to style rules
         new_loaded_styles: dict[object, list] = {}
-        # Traverse all nodes
-        for node in tree_to_list(self.nodes, []):
-            if isinstance(node, Element):
-                # Process <script src="...">
-                if node.tag == "script" and "src" in node.attributes:
-                    src = node.attributes["src"]
-                    # Avoid executing the same script twice
-                    if src not in self.loaded_scripts and self.js:
-                        try:
-                            script_url = self.url.resolve(src)
-                        except Exception:
-                            script_url = None
-                        # Skip if blocked by CSP
-                        if script_url and not self.allowed_request(script_url):
-                            # Disallowed by CSP: ignore script
-                            self.loaded_scripts.add(src)
-                        elif script_url:
-                            try:
-                                # Fetch script with referer and origin headers
-                                ref = str(self.url) if self.url else None
-                                origin = self.url.origin() if self.url else None
-                                h, body = script_url.request(referrer=ref, payload=None, origin=origin)
-                                # Decode script text if bytes
-                                try:
-                                    if isinstance(body, (bytes, bytearray)):
-                                        body = body.decode("utf8", "replace")
-                                except Exception:
-                                    pass
-                                # Instead of running the script immediately,
-                                # schedule a task to run it later. This keeps
-                                # the UI responsive and defers script
-                                # execution until after loading completes.
-                                try:
-                                    task = Task(self.js.run, body)
-                                    self.task_runner.schedule_task(task)
-                                except Exception:
-                                    pass
-                                # Mark this script as loaded to avoid reloading
-                                self.loaded_scripts.add(src)
-                            except Exception:
-                                # Network error: ignore
-                                self.loaded_scripts.add(src)
-                                pass
-                # Process <link rel="stylesheet" href="...">
-                if node.tag == "link" and node.attributes.get("rel", "").casefold() == "stylesheet" and "href" in node.attributes:
-                    href = node.attributes["href"]
-                    # Resolve URL; may raise
+
+        # Phase 1: walk once and collect the fetches we actually need.
+        # Network requests were issued inline during the walk, so N
+        # subresources paid N sequential round-trips; collecting them
+        # first lets phase 2 overlap the waits on a thread pool.
+        ref = str(self.url) if self.url else None
+        origin = self.url.origin() if self.url else None
+        script_fetches: list[tuple[str, 'URL']] = []
+        style_fetches: list[tuple[object, str, 'URL']] = []
+        seen_scripts: set[str] = set()
+        # Iterate only the script/link elements; the index is derived
+        # from the cached flat list and invalidated by tree version.
+        for node in self.get_subresource_nodes():
+            # Process <script src="...">
+            if node.tag == "script" and "src" in node.attributes:
+                src = node.attributes["src"]
+                # Avoid executing the same script twice
+                if src not in self.loaded_scripts and src not in seen_scripts and self.js:
                     try:
-                        css_url = self.url.resolve(href)
+                        script_url = self.url.resolve(src)
                     except Exception:
-                        css_url = None
-                    # Check CSP: skip blocked styles
-                    if css_url and not self.allowed_request(css_url):
-                        # Do not load or parse
-                        continue
-                    # Fetch and parse CSS for new or changed links
-                    if node not in self.loaded_styles:
-                        rules: list[tuple[object, dict[str, str]]] = []
-                        if css_url:
-                            try:
-                                ref = str(self.url) if self.url else None
-                                origin_header = self.url.origin() if self.url else None
-                                h, css_body = css_url.request(referrer=ref, payload=None, origin=origin_header)
-                                # Decode CSS body if bytes
-                                try:
-                                    if isinstance(css_body, (bytes, bytearray)):
-                                        css_body = css_body.decode("utf8", "replace")
-                                except Exception:
-                                    pass
-                                parser = CSSParser(css_body)
-                                rules = parser.parse()
-                            except Exception:
-                                rules = []
-                        new_loaded_styles[node] = rules
+                        script_url = None
+                    # Skip if blocked by CSP
+                    if script_url and not self.allowed_request(script_url):
+                        # Disallowed by CSP: ignore script
+                        self.loaded_scripts.add(src)
+                    elif script_url:
+                        seen_scripts.add(src)
+                        script_fetches.append((src, script_url))
+            # Process <link rel="stylesheet" href="...">
+            if node.tag == "link" and node.attributes.get("rel", "").casefold() == "stylesheet" and "href" in node.attributes:
+                href = node.attributes["href"]
+                # Resolve URL; may raise
+                try:
+                    css_url = self.url.resolve(href)
+                except Exception:
+                    css_url = None
+                # Check CSP: skip blocked styles
+                if css_url and not self.allowed_request(css_url):
+                    # Do not load or parse
+                    continue
+                # Fetch and parse CSS for new or changed links
+                if node not in self.loaded_styles:
+                    if css_url:
+                        # Check the module-level cache first: the same
+                        # stylesheet is often shared across pages, and a
+                        # cache hit skips both the request and the parse.
+                        cache_key = str(css_url)
+                        cached_rules = _css_cache_get(cache_key)
+                        if cached_rules is not None:
+                            new_loaded_styles[node] = cached_rules
+                        else:
+                            new_loaded_styles[node] = []
+                            style_fetches.append((node, cache_key, css_url))
+                    else:
+                        new_loaded_styles[node] = []
+                else:
+                    # keep existing rules if not removed
+                    new_loaded_styles[node] = self.loaded_styles[node]
+
+        # Phase 2: overlap the network waits, then dispatch results in
+        # document order (futures are consumed in submission order, so
+        # script execution order is preserved).
+        if script_fetches or style_fetches:
+            pool = None
+
+            def fetch(u: 'URL'):
+                return u.request(referrer=ref, payload=None, origin=origin)
+
+            # Script text is cached browser-wide by URL; only misses hit
+            # the network. Jobs keep document order either way.
+            script_jobs: list = []
+            for src, u in script_fetches:
+                key = str(u)
+                body = _SCRIPT_BODY_CACHE.get(key)
+                if body is None:
+                    if pool is None:
+                        pool = self._fetch_pool()
+                    script_jobs.append((src, key, pool.submit(fetch, u)))
+                else:
+                    script_jobs.append((src, key, body))
+            # Dedupe concurrent fetches of the same stylesheet URL
+            css_futs: dict[str, object] = {}
+            for _node, key, u in style_fetches:
+                if key not in css_futs:
+                    if pool is None:
+                        pool = self._fetch_pool()
+                    css_futs[key] = pool.submit(fetch, u)
+
+            for src, key, result in script_jobs:
+                try:
+                    if isinstance(result, str):
+                        body = result
                     else:
-                        # keep existing rules if not removed
-                        new_loaded_styles[node] = self.loaded_styles[node]
+                        h, body = result.result()
+                        # Decode script text if bytes
+                        if isinstance(body, (bytes, bytearray)):
+                            body = body.decode("utf8", "replace")
+                        _SCRIPT_BODY_CACHE[key] = body
+                    # Instead of running the script immediately, schedule
+                    # a task to run it later. This keeps the UI responsive
+                    # and defers script execution until loading completes.
+                    try:
+                        task = Task(self.js.run, body)
+                        self.task_runner.schedule_task(task)
+                    except Exception:
+                        pass
+                except Exception:
+                    # Network error: ignore
+                    pass
+                # Mark this script as loaded to avoid reloading
+                self.loaded_scripts.add(src)
+
+            # Parse each stylesheet as soon as its bytes arrive so the
+            # (pure-Python, CPU-bound) parse of one sheet overlaps the
+            # network wait of the others, instead of serializing all
+            # parses after the last fetch completes.
+            css_results: dict[str, list] = {}
+            fut_keys = {fut: key for key, fut in css_futs.items()}
+            for fut in concurrent.futures.as_completed(fut_keys):
+                key = fut_keys[fut]
+                try:
+                    h, css_body = fut.result()
+                    # Decode CSS body if bytes
+                    if isinstance(css_body, (bytes, bytearray)):
+                        css_body = css_body.decode("utf8", "replace")
+                    rules = CSSParser(css_body).parse()
+                    _CSS_RULES_CACHE[key] = (time.time(), rules)
+                    css_results[key] = rules
+                except Exception:
+                    css_results[key] = []
+            # Assign in document order so the cascade is unaffected by
+            # completion order.
+            for node, key, _u in style_fetches:
+                new_loaded_styles[node] = css_results.get(
+                    key, _css_cache_get(key) or [])
         # Update loaded_styles and compute extra_style_rules
         self.loaded_styles = new_loaded_styles
         extra: list[tuple[object, dict[str, str]]] = []
@@ -3133,6 +4159,22 @@ class Tab:
             extra.extend(rules)
         self.extra_style_rules = extra
 
+    def _annotate_form_ancestors(self) -> None:
+        """
+        Tag every node with its enclosing <form> (or None) in one
+        document-order pass. Parents are visited before children, so
+        each node just inherits its parent's answer — O(nodes) total
+        instead of an O(depth) parent walk per click/keypress.
+        """
+        for n in self.get_tree_list():
+            parent = n.parent
+            if parent is None:
+                n._form_ancestor = None
+            elif isinstance(parent, Element) and parent.tag == "form":
+                n._form_ancestor = parent
+            else:
+                n._form_ancestor = getattr(parent, "_form_ancestor", None)
+
     def apply_styles_and_render(self) -> None:
         """
         Apply CSS styles to the DOM and render the page. Combines
@@ -3142,12 +4184,19 @@ class Tab:
         """
         if not self.nodes:
             return
-        # Compose style rules
-        rules = DEFAULT_STYLE_SHEET + self.extra_style_rules
-        # Sort by cascade priority
-        rules.sort(key=cascade_priority)
+        # Precompute form ancestors so event handlers don't walk parents
+        self._annotate_form_ancestors()
+        # Compose style rules. The merged sorted list is identical for
+        # every keystroke/click rerender, so rebuild and re-sort it only
+        # when the loaded stylesheets actually changed.
+        if self._cached_rules is None or \
+                self._cached_rules_src is not self.extra_style_rules:
+            rules = DEFAULT_STYLE_SHEET + self.extra_style_rules
+            rules.sort(key=cascade_priority)
+            self._cached_rules = rules
+            self._cached_rules_src = self.extra_style_rules
         # Apply styles
-        style(self.nodes, rules)
+        style(self.nodes, self._cached_rules)
         # Layout and paint
         self.render()
         # If this tab is active, redraw the browser
@@ -3168,10 +4217,12 @@ class Chrome:
         return Rect(x0, 2, x0 + 128, 28)
     def draw(self): pass
     def click(self, x, y):
-        for i in range(len(self.browser.tabs)):
-            r = self.tab_rect(i)
-            if r.contains_point(x, y):
-                self.browser.switch_tab(i); return
+        # inline tab_rect bounds; no Rect allocation per tab per click
+        if 2 <= y <= 28:
+            for i in range(len(self.browser.tabs)):
+                x0 = 6 + i * 140
+                if x0 <= x <= x0 + 128:
+                    self.browser.switch_tab(i); return
     def keypress(self, char):
         if self.focus == "address bar":
             self.browser.address.insert("end", char)
@@ -3182,6 +4233,37 @@ class Chrome:
     def blur(self):
         self.focus = None
 
+# Flyweight cache of fully-configured skia.Paint objects, keyed by the
+# canonicalized (color, stroke, width, aa) tuple. Constructing a Paint per
+# draw call is the dominant allocation in the Skia path; cached paints are
+# shared and must never be mutated by callers.
+_PAINT_CACHE: dict = {}
+
+def _paint(color=None, stroke=False, width=1, aa=True) -> 'skia.Paint':
+    """Return a shared Paint for the given style; configured once, cached
+    forever. Callers must treat the result as immutable."""
+    key = (color, stroke, max(1, width or 1) if stroke else 0, aa)
+    paint = _PAINT_CACHE.get(key)
+    if paint is None:
+        paint = skia.Paint(AntiAlias=aa)
+        if color is not None:
+            paint.setColor(_parse_color(color))
+        if stroke:
+            paint.setStyle(skia.Paint.kStroke_Style)
+            paint.setStrokeWidth(max(1, width or 1))
+        else:
+            paint.setStyle(skia.Paint.kFill_Style)
+        _PAINT_CACHE[key] = paint
+    return paint
+
+def _get_fill_paint(color: str) -> 'skia.Paint':
+    """Shared fill Paint for a color string (see _paint)."""
+    return _paint(color=color)
+
+def _get_stroke_paint(color: str, width: float = 1) -> 'skia.Paint':
+    """Shared stroke Paint for a color/width pair (see _paint)."""
+    return _paint(color=color, stroke=True, width=width)
+
 class SkiaCanvasAdapter:
     """Adapter exposing Tk-like canvas calls over a Skia canvas"""
     def __init__(self, canvas, y_offset=0):
@@ -3189,22 +4271,36 @@ class SkiaCanvasAdapter:
         self.y_offset = y_offset
 
     def create_rectangle(self, x1, y1, x2, y2, width=0, fill=None, outline=None):
-        paint = skia.Paint(AntiAlias=True)
         if fill and fill != "":
-            paint.setColor(_parse_color(fill))
-            paint.setStyle(skia.Paint.kFill_Style)
-            self.canvas.drawRect(skia.Rect.MakeLTRB(x1, y1 + self.y_offset, x2, y2 + self.y_offset), paint)
+            self.canvas.drawRect(skia.Rect.MakeLTRB(x1, y1 + self.y_offset, x2, y2 + self.y_offset),
+                                 _get_fill_paint(fill))
         if outline and outline != "":
-            paint = skia.Paint(AntiAlias=True)
-            paint.setColor(_parse_color(outline))
-            paint.setStyle(skia.Paint.kStroke_Style)
-            paint.setStrokeWidth(max(1, width or 1))
-            self.canvas.drawRect(skia.Rect.MakeLTRB(x1, y1 + self.y_offset, x2, y2 + self.y_offset), paint)
+            self.canvas.drawRect(skia.Rect.MakeLTRB(x1, y1 + self.y_offset, x2, y2 + self.y_offset),
+                                 _get_stroke_paint(outline, width))
 
-    def create_line(self, x1, y1, x2, y2, fill=None, width=1):
+    def draw_rect_batch(self, xs1, ys1, xs2, ys2, colors):
+        """
+        Draw many filled rectangles given as parallel coordinate/color
+        lists (structure-of-arrays). Paint objects are reused per color
+        run so a batch of N rects issues N drawRect calls but avoids the
+        per-command Python object dispatch of the display-list path.
+        """
+        off = self.y_offset
+        canvas = self.canvas
         paint = skia.Paint(AntiAlias=True)
-        if fill: paint.setColor(_parse_color(fill))
-        paint.setStrokeWidth(max(1, width))
+        paint.setStyle(skia.Paint.kFill_Style)
+        last_color = None
+        for i in range(len(xs1)):
+            c = colors[i]
+            if c != last_color:
+                paint.setColor(_parse_color(c))
+                last_color = c
+            canvas.drawRect(
+                skia.Rect.MakeLTRB(xs1[i], ys1[i] + off, xs2[i], ys2[i] + off),
+                paint)
+
+    def create_line(self, x1, y1, x2, y2, fill=None, width=1):
+        paint = _get_stroke_paint(fill or "black", width)
         self.canvas.drawLine(x1, y1 + self.y_offset, x2, y2 + self.y_offset, paint)
 
     def create_text(self, x, y, text, fill=None, anchor="nw", font=None):
@@ -3217,9 +4313,7 @@ class SkiaCanvasAdapter:
             pass
         # Use our helper to avoid deprecated default fonts
         sk_font = _get_skia_font(size)
-        paint = skia.Paint(AntiAlias=True)
-        if fill:
-            paint.setColor(_parse_color(fill))
+        paint = _get_fill_paint(fill or "black")
         # Tk "nw" anchor: draw at (x,y)
         self.canvas.drawString(text, x, y + self.y_offset, sk_font, paint)
 
@@ -3233,10 +4327,10 @@ class SkiaCanvasAdapter:
             path.moveTo(cx, cy)
             path.arcTo(rect, start, extent, False)
             path.close()
-            self.canvas.drawPath(path, skia.Paint(Color=_parse_color(fill), AntiAlias=True))
+            self.canvas.drawPath(path, _paint(color=fill))
         if outline:
-            paint = skia.Paint(Color=_parse_color(outline), Style=skia.Paint.kStroke_Style, AntiAlias=True)
-            self.canvas.drawArc(rect, start, extent, False, paint)
+            self.canvas.drawArc(rect, start, extent, False,
+                                _paint(color=outline, stroke=True))
 
 class SkiaRenderer:
     def __init__(self, browser):
@@ -3245,21 +4339,103 @@ class SkiaRenderer:
         # that window creation functions work properly; SDL_INIT_EVENTS alone
         # may be insufficient on some platforms.
         sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_EVENTS)
-        flags = sdl2.SDL_WINDOW_SHOWN | sdl2.SDL_WINDOW_ALLOW_HIGHDPI
-        self.window = sdl2.SDL_CreateWindow(b"WBE Browser (Skia)",
-            sdl2.SDL_WINDOWPOS_CENTERED, sdl2.SDL_WINDOWPOS_CENTERED, WIDTH, HEIGHT, flags)
+        # Prefer a GPU-backed (OpenGL) window so Skia renders straight
+        # into the window framebuffer and present is just a buffer swap.
+        # Fall back to the software surface + readPixels path when GL
+        # init fails (headless machines, missing drivers).
+        self.gl_context = None
+        self.gr_context = None
+        self.window = None
+        try:
+            flags = (sdl2.SDL_WINDOW_SHOWN | sdl2.SDL_WINDOW_ALLOW_HIGHDPI |
+                     sdl2.SDL_WINDOW_OPENGL)
+            self.window = sdl2.SDL_CreateWindow(b"WBE Browser (Skia)",
+                sdl2.SDL_WINDOWPOS_CENTERED, sdl2.SDL_WINDOWPOS_CENTERED,
+                WIDTH, HEIGHT, flags)
+            if not self.window:
+                raise RuntimeError("SDL_CreateWindow(OPENGL) failed")
+            self.gl_context = sdl2.SDL_GL_CreateContext(self.window)
+            if not self.gl_context:
+                raise RuntimeError("SDL_GL_CreateContext failed")
+            sdl2.SDL_GL_MakeCurrent(self.window, self.gl_context)
+            self.gr_context = skia.GrDirectContext.MakeGL()
+            if not self.gr_context:
+                raise RuntimeError("GrDirectContext.MakeGL failed")
+            # Framebuffer 0 is the window's default framebuffer;
+            # 0x8058 is GL_RGBA8.
+            fb_info = skia.GrGLFramebufferInfo(0, 0x8058)
+            target = skia.GrBackendRenderTarget(WIDTH, HEIGHT, 0, 0, fb_info)
+            self.surface_root = skia.Surface.MakeFromBackendRenderTarget(
+                self.gr_context, target,
+                skia.kBottomLeft_GrSurfaceOrigin,
+                skia.kRGBA_8888_ColorType, None)
+            if self.surface_root is None:
+                raise RuntimeError("MakeFromBackendRenderTarget failed")
+        except Exception:
+            # Software fallback: plain SDL window + raster surface
+            if self.gl_context:
+                try:
+                    sdl2.SDL_GL_DeleteContext(self.gl_context)
+                except Exception:
+                    pass
+            if self.window:
+                try:
+                    sdl2.SDL_DestroyWindow(self.window)
+                except Exception:
+                    pass
+            self.gl_context = None
+            self.gr_context = None
+            flags = sdl2.SDL_WINDOW_SHOWN | sdl2.SDL_WINDOW_ALLOW_HIGHDPI
+            self.window = sdl2.SDL_CreateWindow(b"WBE Browser (Skia)",
+                sdl2.SDL_WINDOWPOS_CENTERED, sdl2.SDL_WINDOWPOS_CENTERED,
+                WIDTH, HEIGHT, flags)
+            self.surface_root = skia.Surface(WIDTH, HEIGHT)
         self.chrome_h = 44
-        self.surface_root = skia.Surface(WIDTH, HEIGHT)
         self.surface_tab = skia.Surface(WIDTH, HEIGHT)   # big enough; clip+translate when drawing
-        self.addr_text = ""
+        # Address bar text lives in a per-codepoint list; typing appends
+        # and backspace pops in O(1) instead of rebuilding the string.
+        # The joined string is materialized lazily via the addr_text
+        # property, only on frames that actually draw (or on Enter).
+        self._addr_chars: list[str] = []
+        self._addr_cache: str = ""
         self.btn_back = (8, 8, 36, 36)
         self.btn_fwd = (40, 8, 68, 36)
         self.btn_reload = (72, 8, 100, 36)
         self.addr_rect = (108, 10, WIDTH - 12, 34)
-        self.sdl_surface = sdl2.SDL_GetWindowSurface(self.window)
+        self.sdl_surface = None if self.gr_context else \
+            sdl2.SDL_GetWindowSurface(self.window)
 
         # Store HTTPS secure state for padlock display
         self._secure = False
+        # Dirty flag gating draw_frame. Rebuilding the display list and
+        # copying the full surface to SDL every tick is wasted memory
+        # bandwidth when nothing changed; input events and chrome state
+        # changes set this flag, and mainloop only draws when it's set.
+        self._dirty = True
+        # When True, the next present copies the whole surface even if
+        # dirty rects were recorded (content changed, not just chrome).
+        self._full_frame = True
+        # Dirty rectangles for partial present. Paint sites append
+        # (x1, y1, x2, y2) regions here; _present copies only their
+        # union to the SDL surface instead of the whole window. An
+        # empty list means "everything" (full copy).
+        self._dirty_rects: list[tuple[int, int, int, int]] = []
+
+    @property
+    def addr_text(self) -> str:
+        if self._addr_cache is None:
+            self._addr_cache = "".join(self._addr_chars)
+        return self._addr_cache
+
+    @addr_text.setter
+    def addr_text(self, value: str) -> None:
+        self._addr_chars = list(value)
+        self._addr_cache = value
+
+    def mark_dirty_rect(self, x1, y1, x2, y2):
+        """Record a changed window region and mark the frame dirty."""
+        self._dirty_rects.append((int(x1), int(y1), int(x2), int(y2)))
+        self._dirty = True
 
     def draw_frame(self):
         # clear root with dark or light background
@@ -3275,7 +4451,7 @@ class SkiaRenderer:
 
         # draw chrome
         rootc.drawRect(skia.Rect.MakeLTRB(0, 0, WIDTH, self.chrome_h),
-                       skia.Paint(Color=_parse_color("#f1f5f9")))
+                       _get_fill_paint("#f1f5f9"))
         self._draw_button(rootc, self.btn_back, "←")
         self._draw_button(rootc, self.btn_fwd, "→")
         self._draw_button(rootc, self.btn_reload, "⟳")
@@ -3290,7 +4466,7 @@ class SkiaRenderer:
                 px = self.addr_rect[0] - 20
                 py = self.addr_rect[1] + 14
                 rootc.drawString("\N{lock}", px, py, pad_font,
-                                  skia.Paint(Color=_parse_color("#111111")))
+                                  _get_fill_paint("#111111"))
         except Exception:
             # If anything goes wrong (e.g., typeface unavailable), ignore
             pass
@@ -3306,20 +4482,41 @@ class SkiaRenderer:
             tab_bg = skia.ColorWHITE
         tabc.clear(tab_bg)
 
-        # Let browser build its display list (same as Tk path) and execute on a SkiaCanvasAdapter
-        # Clear previously registered widget boxes so hit-testing only uses
-        # elements from the current frame
-        try:
-            Browser._clear_widget_boxes()
-        except Exception:
-            pass
+        # Let browser build its display list (same as Tk path) and execute
+        # on a SkiaCanvasAdapter. Widget hit-test boxes are generational
+        # and owned by the layout pass, so drawing never touches them
+        # (the old clear here wiped boxes without re-registering any,
+        # breaking hit-testing until the next layout).
         cmds = self.browser.build_display_list()
         adapter = SkiaCanvasAdapter(tabc, y_offset=-self.browser.active_tab.scroll + self.chrome_h)
+        # Batch consecutive solid rects into parallel coordinate/color
+        # lists and flush them with one adapter call. Runs are flushed
+        # whenever a non-rect command appears so paint order is kept.
+        rx1: list[float] = []; ry1: list[float] = []
+        rx2: list[float] = []; ry2: list[float] = []
+        rcolors: list[str] = []
+
+        def flush_rects():
+            if rx1:
+                try:
+                    adapter.draw_rect_batch(rx1, ry1, rx2, ry2, rcolors)
+                except Exception:
+                    pass
+                rx1.clear(); ry1.clear(); rx2.clear(); ry2.clear()
+                rcolors.clear()
+
         for cmd in cmds:
+            if type(cmd) is DrawRect:
+                rx1.append(cmd.left); ry1.append(cmd.top)
+                rx2.append(cmd.right); ry2.append(cmd.bottom)
+                rcolors.append(cmd.color)
+                continue
+            flush_rects()
             try:
                 cmd.execute(0, adapter)  # scroll already encoded in adapter
             except Exception:
                 pass
+        flush_rects()
 
         # composite: draw tab surface into root clipped under chrome
         rootc.save()
@@ -3341,8 +4538,8 @@ class SkiaRenderer:
             if txt:
                 rootc = self.surface_root.getCanvas()
                 font = _get_skia_font(12)
-                paint_bg = skia.Paint(Color=_parse_color("#222222"))
-                paint_fg = skia.Paint(Color=_parse_color("#ffffff"))
+                paint_bg = _get_fill_paint("#222222")
+                paint_fg = _get_fill_paint("#ffffff")
                 # simple strip
                 rootc.drawRect(skia.Rect.MakeLTRB(0, HEIGHT-20, WIDTH, HEIGHT), paint_bg)
                 rootc.drawString(txt, 8, HEIGHT-6, font, paint_fg)
@@ -3357,7 +4554,20 @@ class SkiaRenderer:
         using Image.readPixels and the buffer protocol. Using readPixels avoids
         the need to construct a Pixmap with a ctypes pointer, which can cause
         "Buffer does not have dimensions" errors on some versions of skia‑python.
+
+        On the GPU path the surface renders directly into the window's
+        default framebuffer, so presenting is a flush + buffer swap with
+        no CPU-side pixel copy at all.
         """
+        if self.gr_context is not None:
+            try:
+                self.surface_root.flushAndSubmit()
+                sdl2.SDL_GL_SwapWindow(self.window)
+            except Exception:
+                pass
+            self._dirty_rects = []
+            self._full_frame = False
+            return
         # Lock the SDL surface for direct pixel access
         sdl2.SDL_LockSurface(self.sdl_surface)
         try:
@@ -3376,46 +4586,77 @@ class SkiaRenderer:
         row_bytes = getattr(sf, 'pitch', 0)
         pixels_ptr = getattr(sf, 'pixels', None)
 
+        # Union of dirty rects, clamped to the surface. Empty list (or a
+        # full-frame invalidation) means copy everything.
+        update_rect = None
+        if self._dirty_rects and not getattr(self, '_full_frame', True):
+            x1 = max(0, min(r[0] for r in self._dirty_rects))
+            y1 = max(0, min(r[1] for r in self._dirty_rects))
+            x2 = min(sf.w, max(r[2] for r in self._dirty_rects))
+            y2 = min(sf.h, max(r[3] for r in self._dirty_rects))
+            if x2 > x1 and y2 > y1:
+                update_rect = (x1, y1, x2, y2)
+
         if pixels_ptr and height and row_bytes:
-            # Compute the total size of the pixel buffer
-            size = row_bytes * height
             # Construct a ctypes array that points into the SDL surface memory
+            size = row_bytes * height
             buf_type = ctypes.c_ubyte * size
             buf = buf_type.from_address(pixels_ptr)
-            # Wrap in a memoryview so skia can treat it as a Python buffer
             mv = memoryview(buf)
             # Take a snapshot of the current Skia surface
             img = self.surface_root.makeImageSnapshot()
-            # Copy pixels into the SDL buffer. We ignore the return value,
-            # as it may return False if readPixels fails.
             try:
-                img.readPixels(info, mv, row_bytes)
+                if update_rect:
+                    # Copy only the dirty sub-rectangle: destination is
+                    # the same offset inside the SDL buffer, source is
+                    # the matching region of the snapshot.
+                    x1, y1, x2, y2 = update_rect
+                    sub_info = skia.ImageInfo.Make(
+                        x2 - x1, y2 - y1,
+                        skia.ColorType.kRGBA_8888_ColorType,
+                        skia.AlphaType.kPremul_AlphaType)
+                    offset = y1 * row_bytes + x1 * 4
+                    img.readPixels(sub_info, mv[offset:], row_bytes, x1, y1)
+                else:
+                    img.readPixels(info, mv, row_bytes)
             except Exception:
                 # If readPixels raises, silently ignore; we'll still unlock surface
                 pass
 
-        # Unlock the surface and update the window
+        # Unlock the surface and update the window (whole window or just
+        # the dirty rect when one was computed)
         sdl2.SDL_UnlockSurface(self.sdl_surface)
-        sdl2.SDL_UpdateWindowSurface(self.window)
+        if update_rect:
+            try:
+                x1, y1, x2, y2 = update_rect
+                rect = sdl2.SDL_Rect(x1, y1, x2 - x1, y2 - y1)
+                sdl2.SDL_UpdateWindowSurfaceRects(
+                    self.window, ctypes.byref(rect), 1)
+            except Exception:
+                sdl2.SDL_UpdateWindowSurface(self.window)
+        else:
+            sdl2.SDL_UpdateWindowSurface(self.window)
+        self._dirty_rects = []
+        self._full_frame = False
 
     def _in(self, x, y, r): x1,y1,x2,y2 = r; return x1 <= x <= x2 and y1 <= y <= y2
 
     def _draw_button(self, canvas, rect, label):
         x1,y1,x2,y2 = rect
         rr = skia.RRect.MakeRectXY(skia.Rect.MakeLTRB(x1,y1,x2,y2), 6,6)
-        canvas.drawRRect(rr, skia.Paint(Color=_parse_color("#e5e7eb")))
+        canvas.drawRRect(rr, _get_fill_paint("#e5e7eb"))
         # Use non-deprecated font for button label
         # Use helper to avoid deprecated default font
         fnt = _get_skia_font(16)
-        canvas.drawString(label, x1+10, y1+12, fnt, skia.Paint(Color=_parse_color("#111111")))
+        canvas.drawString(label, x1+10, y1+12, fnt, _get_fill_paint("#111111"))
 
     def _draw_address(self, canvas, rect, text):
         x1,y1,x2,y2 = rect
         rr = skia.RRect.MakeRectXY(skia.Rect.MakeLTRB(x1,y1,x2,y2), 8,8)
-        canvas.drawRRect(rr, skia.Paint(Color=_parse_color("#ffffff")))
+        canvas.drawRRect(rr, _get_fill_paint("#ffffff"))
         # Use helper to avoid deprecated default font for address text
         fnt = _get_skia_font(14)
-        canvas.drawString(text, x1+10, y1+14, fnt, skia.Paint(Color=_parse_color("#111111")))
+        canvas.drawString(text, x1+10, y1+14, fnt, _get_fill_paint("#111111"))
 
     def mainloop(self):
         event = sdl2.SDL_Event()
@@ -3425,6 +4666,11 @@ class SkiaRenderer:
             self.addr_text = str(self.browser.active_tab.url)
         while True:
             while sdl2.SDL_PollEvent(ctypes.byref(event)) != 0:
+                # Any input event can change visible state
+                if event.type in (sdl2.SDL_MOUSEBUTTONUP,
+                                  sdl2.SDL_KEYDOWN, sdl2.SDL_TEXTINPUT):
+                    self._dirty = True
+                    self._full_frame = True
                 if event.type == sdl2.SDL_QUIT:
                     self._quit()
                 elif event.type == sdl2.SDL_MOUSEBUTTONUP:
@@ -3455,71 +4701,205 @@ class SkiaRenderer:
                             except Exception:
                                 pass
                     elif sym == sdl2.SDLK_BACKSPACE:
-                        self.addr_text = self.addr_text[:-1]
+                        if self._addr_chars:
+                            self._addr_chars.pop()
+                            self._addr_cache = None
                     elif sym == sdl2.SDLK_DOWN:
                         self.browser.active_tab.scrolldown()
                     elif sym == sdl2.SDLK_UP:
                         self.browser.active_tab.scrollup()
                 elif event.type == sdl2.SDL_TEXTINPUT:
-                    self.addr_text += event.text.text.decode('utf8')
+                    # One-codepoint strings keep backspace a single pop
+                    self._addr_chars.extend(event.text.text.decode('utf8'))
+                    self._addr_cache = None
             # Run one pending task for the active tab before drawing
             try:
                 tab = self.browser.active_tab
                 if hasattr(tab, 'task_runner'):
                     tab.task_runner.run()
+                if getattr(tab, 'needs_render', False):
+                    # Actually produce the new display list: render()
+                    # clears needs_render and drops the stale paint
+                    # cache, so draw_frame below rasterizes fresh
+                    # content and the idle-skip works next iteration.
+                    tab.render()
+                    self._dirty = True
+                    self._full_frame = True
             except Exception:
                 pass
-            self.draw_frame()
-            sdl2.SDL_Delay(10)
+            # Skip the whole raster + present pipeline when nothing is
+            # dirty; sleep longer when idle to cut wakeups.
+            if self._dirty:
+                self.draw_frame()
+                self._dirty = False
+                sdl2.SDL_Delay(10)
+            else:
+                sdl2.SDL_Delay(30)
 
     def _quit(self):
+        if self.gl_context:
+            try:
+                sdl2.SDL_GL_DeleteContext(self.gl_context)
+            except Exception:
+                pass
         if self.window: sdl2.SDL_DestroyWindow(self.window)
         sdl2.SDL_Quit()
         sys.exit(0)
 
     def update_address_bar(self):
         if self.browser.active_tab and self.browser.active_tab.url:
-            self.addr_text = str(self.browser.active_tab.url) 
+            self.addr_text = str(self.browser.active_tab.url)
+            self.mark_dirty_rect(*self.addr_rect)
 
     # Allow Browser to store HTTPS secure state
     def set_padlock(self, secure: bool):
-        self._secure = bool(secure)
+        if bool(secure) != self._secure:
+            self._secure = bool(secure)
+            # Padlock draws just left of the address bar
+            x1, y1, x2, y2 = self.addr_rect
+            self.mark_dirty_rect(x1 - 24, y1, x1, y2)
 
     def set_status(self, msg):
         # Option A: just store it and draw at bottom in draw_frame()
-        self.status_text = msg
+        if getattr(self, 'status_text', None) != msg:
+            self.status_text = msg
+            self.mark_dirty_rect(0, HEIGHT - 20, WIDTH, HEIGHT)
+
+# Guard bits separating the two 32-bit lanes of a packed point/bound:
+# bit 32 caps the y lane, bit 65 the x lane. A lane-wise >= test is a
+# single subtraction whose per-lane borrows land in the guard bits.
+_WB_GUARD = (1 << 32) | (1 << 65)
+
+# Fixed-point scale for packed widget-box coordinates: 5 fractional
+# bits keep sub-pixel box edges exact to 1/32px (scroll offsets are
+# floats, so query points are fractional in practice) while leaving a
+# 27-bit integer part per 32-bit lane.
+_WB_SCALE = 32
+
+def _hit_scan(candidates, g, p, lo, hi, gen):
+    """
+    Reverse scan of grid-cell candidates against packed SoA bounds;
+    returns the index of the topmost hit or -1. p is the query point
+    packed as (x << 33) | y in _WB_SCALE fixed point. Containment is
+    two masked subtractions:
+    (pg - lo) borrows out of a guard bit iff the point is left of /
+    above the box, and (hi - p) likewise for right of / below (hi is
+    stored with guard bits pre-set). Note a plain two-int lexicographic
+    compare is *not* a valid rectangle test — the guard-bit form keeps
+    the lanes independent.
+    """
+    pg = p | _WB_GUARD
+    G = _WB_GUARD
+    for i in range(len(candidates) - 1, -1, -1):
+        j = candidates[i]
+        if gen[j] == g and \
+           (pg - lo[j]) & G == G and (hi[j] - p) & G == G:
+            return j
+    return -1
 
 class Browser:
 
     def build_display_list(self):
-        """Collect display commands from the layout tree (Draw* objects)."""
+        """Collect display commands from the layout tree (Draw* objects).
+
+        The collection is memoized on the tab: the layout tree only
+        changes in Tab.render (which clears _paint_cache), so scroll and
+        chrome-only frames reuse the previous list instead of re-walking
+        the whole tree per draw.
+        """
+        tab = self.active_tab
+        if not (tab and getattr(tab, "document", None)):
+            return []
+        cached = getattr(tab, "_paint_cache", None)
+        if cached is not None:
+            return cached
+        # Iterative depth-first walk: every layout class defines
+        # should_paint and children, so the hasattr/getattr guards and
+        # the per-node recursive call are pure overhead on deep trees.
         cmds = []
-        if self.active_tab and getattr(self.active_tab, "document", None):
-            def collect(layout):
-                if hasattr(layout, "should_paint") and layout.should_paint():
-                    cmds.extend(layout.paint())
-                for c in getattr(layout, "children", []): collect(c)
-            collect(self.active_tab.document)
+        extend = cmds.extend
+        stack = [tab.document]
+        pop = stack.pop
+        while stack:
+            layout = pop()
+            # shares paint_tree's per-node should_paint memo
+            v = getattr(layout, "_paint_visible", None)
+            if v is None:
+                v = layout._paint_visible = layout.should_paint()
+            if v:
+                extend(layout.paint())
+            children = layout.children
+            if children:
+                # push in reverse to keep document (paint) order
+                stack.extend(reversed(children))
+        tab._paint_cache = cmds
         return cmds
 
     def draw_for_renderer(self, renderer):
         """Used by non-Tk renderers to trigger a paint without Tk canvas assumptions."""
         if hasattr(renderer, "draw_frame"):
             renderer.draw_frame()
-    _widget_boxes = []  # (rect, element)
+    # Widget hit-test boxes in structure-of-arrays form: parallel lists
+    # indexed together. Bounds are packed two-lanes-per-int (x in bits
+    # 33..64, y in bits 0..31, guard bits between) in _WB_SCALE fixed
+    # point, so containment is two SWAR borrow tests instead of four
+    # list reads + four compares, and fractional edges stay exact to
+    # 1/32px instead of snapping a whole pixel outward.
+    _wb_lo: list = []    # packed (x1, y1), rounded down
+    _wb_hi: list = []    # packed (x2, y2), rounded down | guard bits
+    _wb_elt: list = []
+    _wb_gen: list = []
+    _widget_box_gen = 0
+    # Uniform spatial grid over the boxes: cell -> indices into the
+    # arrays, 64px cells. Point queries only scan the one cell the
+    # point falls in instead of every registered box.
+    _WIDGET_GRID_SHIFT = 6
+    _widget_grid: dict = {}
     @classmethod
     def _register_widget_box(cls, element, rect_tuple):
         x1,y1,x2,y2 = rect_tuple
-        cls._widget_boxes.append((Rect(x1,y1,x2,y2), element))
+        idx = len(cls._wb_elt)
+        # Floor everything (queries floor too): a true containment can
+        # then never be missed, and false hits only occur within 1/32px
+        # outside an edge.
+        f = _WB_SCALE
+        cls._wb_lo.append((max(0, int(x1 * f)) << 33) |
+                          max(0, int(y1 * f)))
+        cls._wb_hi.append((max(0, int(x2 * f)) << 33) |
+                          max(0, int(y2 * f)) | _WB_GUARD)
+        cls._wb_elt.append(element)
+        cls._wb_gen.append(cls._widget_box_gen)
+        s = cls._WIDGET_GRID_SHIFT
+        grid = cls._widget_grid
+        for cx in range(int(x1) >> s, (int(x2) >> s) + 1):
+            for cy in range(int(y1) >> s, (int(y2) >> s) + 1):
+                grid.setdefault((cx, cy), []).append(idx)
     @classmethod
-    def _clear_widget_boxes(cls):
-        cls._widget_boxes = []
+    def _new_widget_box_frame(cls):
+        # Starting a new generation implicitly discards older boxes
+        # (hit-testing filters on the current generation), so no O(n)
+        # clear runs per frame; compact only when the arrays have grown.
+        cls._widget_box_gen += 1
+        if len(cls._wb_elt) > 4096:
+            # every entry predates the new generation, so drop them all
+            cls._wb_lo = []; cls._wb_hi = []
+            cls._wb_elt = []; cls._wb_gen = []
+            cls._widget_grid = {}
     @classmethod
     def _hit_widget(cls, x, y):
-        for r, elt in reversed(cls._widget_boxes):
-            if r.contains_point(x, y):
-                return elt
-        return None
+        if x < 0 or y < 0:
+            return None
+        s = cls._WIDGET_GRID_SHIFT
+        # The grid stays in whole-pixel space; only the packed compare
+        # uses fixed point.
+        candidates = cls._widget_grid.get((int(x) >> s, int(y) >> s))
+        if not candidates:
+            return None
+        f = _WB_SCALE
+        j = _hit_scan(candidates, cls._widget_box_gen,
+                      (int(x * f) << 33) | int(y * f),
+                      cls._wb_lo, cls._wb_hi, cls._wb_gen)
+        return cls._wb_elt[j] if j >= 0 else None
 
     def __init__(self):
         # Flags used for task scheduling and rendering cadence. See Chapter 12.
@@ -3527,13 +4907,34 @@ class Browser:
         # browser's chrome and active tab. Tabs set this flag when their
         # display list changes (e.g., after a render).
         self.needs_raster_and_draw: bool = False
+        # Window visibility ("rendering opportunity" gate): while the
+        # window is unmapped, draws are skipped and the dirty flag is
+        # kept so one repaint catches up when it is mapped again.
+        self._visible: bool = True
         # Indicates whether an animation frame task should be scheduled. When a
         # web page calls requestAnimationFrame or when a tab marks itself as
         # needing render, this flag is set. The browser uses it to avoid
         # scheduling multiple render tasks in a row.
         self.needs_animation_frame: bool = True
-        # Handle to an in-flight timer that schedules the next animation frame.
+        # Coalescing token: truthy while a frame is pending. Multiple
+        # set_needs_animation_frame calls within one refresh interval
+        # collapse into a single wakeup of the scheduler thread.
         self.animation_timer = None
+        # One persistent daemon thread replaces the per-frame
+        # threading.Timer (which spawned a fresh OS thread every
+        # REFRESH_RATE_SEC). It sleeps on an Event between frames.
+        self._frame_event = threading.Event()
+        self._frame_thread = threading.Thread(
+            target=self._frame_loop, daemon=True)
+        self._frame_thread.start()
+        # Frame handoff queue for the Tk path. draw() only packages the
+        # frame; a consumer thread hands it back to the Tk event loop
+        # via after_idle. maxsize=1 means a newer frame replaces a
+        # not-yet-presented one, so presentations naturally coalesce.
+        self._raster_queue: 'queue.Queue' = queue.Queue(maxsize=1)
+        self._raster_thread = threading.Thread(
+            target=self._raster_loop, daemon=True)
+        self._raster_thread.start()
 
         # ----- Accessibility state -----
         # Global dark mode flag controlling whether the browser chrome and
@@ -3603,6 +5004,13 @@ class Browser:
         self.status = tkinter.Label(self.window, text="", anchor="w")
         self.status.pack(fill="x")
 
+        # Cache bound widget methods used on hot chrome-update paths so
+        # per-call code skips the attribute/descriptor walk.
+        self._pad_config = self.padlock.config
+        self._status_config = self.status.config
+        self._addr_delete = self.address.delete
+        self._addr_insert = self.address.insert
+
         # bindings
         self.window.bind("<Return>", lambda e: self.handle_enter())
         self.window.bind("<Down>",   lambda e: self.scroll_active(+SCROLL_STEP))
@@ -3616,6 +5024,10 @@ class Browser:
         self.canvas.bind("<B1-Motion>", self.handle_drag)
         self.canvas.bind("<ButtonRelease-1>", self.handle_release)
         self.window.bind("<Key>", self.handle_key)
+        # Visibility tracking: stop drawing while minimized/hidden and
+        # catch up with one repaint on re-map.
+        self.window.bind("<Map>", self._on_window_map)
+        self.window.bind("<Unmap>", self._on_window_unmap)
 
         self._bind_accels()
 
@@ -3640,10 +5052,10 @@ class Browser:
             secure = (url.scheme == 'https' and not getattr(tab, 'cert_error', False))
 
         # Update Tk padlock label if present
-        pad = getattr(self, 'padlock', None)
-        if pad is not None:
+        pad_config = getattr(self, '_pad_config', None)
+        if pad_config is not None:
             try:
-                pad.config(text=("\N{lock}" if secure else ""))
+                pad_config(text=("\N{lock}" if secure else ""))
             except Exception:
                 pass
 
@@ -3674,6 +5086,15 @@ class Browser:
         self.window.bind("<Command-Right>", lambda e: next_tab())
         self.window.bind("<Command-Left>",  lambda e: prev_tab())
 
+    def _on_window_map(self, event=None) -> None:
+        self._visible = True
+        # One repaint to catch up on anything skipped while hidden
+        self.set_needs_raster_and_draw()
+        self.raster_and_draw()
+
+    def _on_window_unmap(self, event=None) -> None:
+        self._visible = False
+
     # -------- tabs --------
     def current_tab(self) -> Tab:
         return self.tabs[self.active_tab_index]
@@ -3734,25 +5155,39 @@ class Browser:
         tabbar = getattr(self, 'tabbar', None)
         if tabbar is None:
             return
-        # Clear existing tab buttons
-        for w in tabbar.winfo_children():
-            w.destroy()
-        # Recreate tab buttons
-        for i, t in enumerate(self.tabs):
+        # Keep the widgets alive and reconcile in place: destroying and
+        # recreating 3 widgets per tab on every add/close/switch was
+        # O(tabs) Tcl round-trips of churn.
+        cells = getattr(self, '_tab_cells', None)
+        if cells is None:
+            cells = self._tab_cells = []
+        plus = getattr(self, '_plus_btn', None)
+        if plus is None:
+            self._plus_btn = plus = tkinter.Button(
+                tabbar, text="+", width=3,
+                command=lambda: self.new_tab(URL("https://example.org/")))
+            plus.pack(side="left", padx=4, pady=2)
+        # Drop cells for closed tabs
+        while len(cells) > len(self.tabs):
+            cell, b, xbtn = cells.pop()
+            cell.destroy()
+        # Add cells for new tabs, packed before the "+" button
+        while len(cells) < len(self.tabs):
             cell = tkinter.Frame(tabbar, bd=0, relief="flat", bg="#e6e6e6")
-            title = t.title or "New Tab"
-            title_txt = title[:24] + ("…" if len(title) > 24 else "")
-            b = tkinter.Button(cell, text=title_txt,
-                               command=lambda j=i: self.switch_tab(j),
-                               relief="sunken" if i == self.active_tab_index else "raised")
+            b = tkinter.Button(cell)
             b.pack(side="left", padx=(2,2), pady=2)
-            xbtn = tkinter.Button(cell, text="×", width=2,
-                                  command=lambda j=i: self.close_tab(j))
+            xbtn = tkinter.Button(cell, text="×", width=2)
             xbtn.pack(side="left", padx=(2,4), pady=2)
-            cell.pack(side="left")
-        plus = tkinter.Button(tabbar, text="+", width=3,
-                              command=lambda: self.new_tab(URL("https://example.org/")))
-        plus.pack(side="left", padx=4, pady=2)
+            cell.pack(side="left", before=plus)
+            cells.append((cell, b, xbtn))
+        # Configure titles, relief, and (index-shifted) commands in place
+        for i, (t, (cell, b, xbtn)) in enumerate(zip(self.tabs, cells)):
+            title = t.title or "New Tab"
+            title_txt = title[:24] + ("…" if len(title) > 24 else "")
+            b.configure(text=title_txt,
+                        command=lambda j=i: self.switch_tab(j),
+                        relief="sunken" if i == self.active_tab_index else "raised")
+            xbtn.configure(command=lambda j=i: self.close_tab(j))
 
     # -------- focus & events --------
     def handle_click(self, e):
@@ -3779,8 +5214,14 @@ class Browser:
         self.address.selection_clear()
         self.address.icursor("end")
         self.chrome_ctl.blur()
-        self.current_tab().blur()
-        self.current_tab().click(e.x, e.y)
+        tab = self.current_tab()
+        tab.blur()
+        tab.click(e.x, e.y)
+        # Flush the render the click dirtied before presenting, so
+        # checkbox toggles and focus changes appear on this click
+        # rather than whenever the next animation frame fires.
+        # render() is a no-op when the click changed nothing.
+        tab.render()
         self.draw()
 
     def handle_drag(self, e):
@@ -3846,7 +5287,10 @@ class Browser:
                 return
             # Otherwise forward printable characters to page
             if e.char and len(e.char) == 1 and ord(e.char) >= 32:
-                self.current_tab().keypress(e.char)
+                tab = self.current_tab()
+                tab.keypress(e.char)
+                # As in handle_click: present the typed character now
+                tab.render()
                 self.draw()
         except Exception:
             pass
@@ -3866,10 +5310,10 @@ class Browser:
         self._status_text = msg
 
         # Update Tk label if present
-        lbl = getattr(self, "status", None)
-        if lbl is not None:
+        status_config = getattr(self, "_status_config", None)
+        if status_config is not None:
             try:
-                lbl.config(text=msg)
+                status_config(text=msg)
             except Exception:
                 pass
 
@@ -3888,11 +5332,11 @@ class Browser:
         :param url_str: The string to display in the address bar.
         """
         # Update Tk Entry if present
-        addr = getattr(self, 'address', None)
-        if addr is not None:
+        addr_delete = getattr(self, '_addr_delete', None)
+        if addr_delete is not None:
             try:
-                addr.delete(0, 'end')
-                addr.insert(0, url_str)
+                addr_delete(0, 'end')
+                self._addr_insert(0, url_str)
             except Exception:
                 pass
         # Update Skia address bar text directly
@@ -3925,47 +5369,46 @@ class Browser:
         else: tab.scrollup(-delta)
         self.draw()
 
-    def on_wheel(self, e):
-        # Normalize wheel delta to "pixels" of scroll
-        if sys.platform == "darwin":
-            # macOS gives small deltas; invert so down = positive scroll
-            step = -float(e.delta) * 4.0     # tweak 3.0–6.0 to taste
-        else:
-            # Windows typically +/-120 per notch
-            step = -int(e.delta / 120) * 40  # 40–60 feels good
-        self._enqueue_scroll(step)
+    def _on_wheel_mac(self, e):
+        # macOS gives small deltas; invert so down = positive scroll
+        self._enqueue_scroll(-float(e.delta) * 4.0)  # tweak 3.0–6.0 to taste
+
+    def _on_wheel_win(self, e):
+        # Windows typically +/-120 per notch
+        self._enqueue_scroll(-int(e.delta / 120) * 40)  # 40–60 feels good
+
+    # sys.platform is fixed for the process, so specialize once at
+    # class level instead of branching on every wheel event.
+    on_wheel = _on_wheel_mac if sys.platform == "darwin" else _on_wheel_win
 
     def on_wheel_linux(self, e):
         step = -40 if e.num == 4 else +40
         self._enqueue_scroll(step)
 
     def _enqueue_scroll(self, step):
-        # Accumulate velocity and kick the animation loop
+        # Accumulate velocity and ride the animation-frame cadence.
+        # Inertia used to run its own window.after(16) chain, which
+        # double-scheduled against the frame timer and drifted from it;
+        # now scroll decay, render, and present share one tick.
         self._scroll_velocity += step
-        if not self._scroll_animating:
-            self._scroll_animating = True
-            self._scroll_tick()
+        self._scroll_animating = True
+        self.needs_animation_frame = True
+        self.schedule_animation_frame()
 
-    def _scroll_tick(self):
-        # Apply a chunk of velocity each frame, then decay
-        # Split big velocities into multiple smaller scrollActive calls
+    def _scroll_step_once(self) -> bool:
+        # Apply one frame's worth of velocity, then decay. Returns
+        # whether inertia is still live (caller re-arms the frame chain).
         v = self._scroll_velocity
-        # Nothing left? stop.
         if abs(v) < 0.5:
             self._scroll_velocity = 0.0
             self._scroll_animating = False
-            return
-
-        # Apply an integer step this frame
+            return False
         step = int(v)
         if step != 0:
             self.scroll_active(step)
-
         # Decay velocity for smooth easing-out
         self._scroll_velocity = v * 0.85   # 0.80–0.92: lower = more damping
-
-        # Schedule next frame (~60fps)
-        self.window.after(16, self._scroll_tick)
+        return True
 
 
     # -------- painting --------
@@ -3978,13 +5421,14 @@ class Browser:
         Tk mode, it clears the Tk canvas and executes the display list to
         draw widgets and the scrollbar.
         """
-        # Before drawing, run one pending task for the active tab (if any).
-        try:
-            tab = self.current_tab()
-            if hasattr(tab, 'task_runner'):
-                tab.task_runner.run()
-        except Exception:
-            pass
+        # No rendering opportunity while hidden; remember to repaint
+        # once the window is mapped again.
+        if not getattr(self, '_visible', True):
+            self.needs_raster_and_draw = True
+            return
+        # Note: pending tab tasks are run on the animation-frame path
+        # (_frame_loop), not here — draw() is a pure present so scroll,
+        # drag, and tab switches aren't taxed with task execution.
 
         # If a Skia renderer is active, let it handle drawing
         rnd = getattr(self, "renderer", None)
@@ -3994,27 +5438,255 @@ class Browser:
                 return
             except Exception:
                 pass
-        # Tk fallback: draw on canvas
+        # Tk fallback: hand the frame to the raster thread. draw() is
+        # now a pure producer, so event handlers return immediately
+        # instead of serializing with canvas painting.
         tab = self.current_tab()
         canvas = getattr(self, "canvas", None)
         if canvas is None:
             return
+        payload = (tab, tab.display_list, tab.scroll)
+        try:
+            self._raster_queue.put_nowait(payload)
+        except queue.Full:
+            # Replace the stale pending frame with this one
+            try:
+                self._raster_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._raster_queue.put_nowait(payload)
+            except queue.Full:
+                pass
+
+    def _raster_loop(self) -> None:
+        """Consumer side of the frame queue: bounce each frame back onto
+        the Tk thread with after_idle (canvas calls must stay there)."""
+        while True:
+            payload = self._raster_queue.get()
+            canvas = getattr(self, "canvas", None)
+            if canvas is None:
+                continue
+            try:
+                canvas.after_idle(
+                    lambda p=payload: self._apply_frame(p))
+            except Exception:
+                pass
+
+    def _compile_display_list(self, display_list, canvas):
+        """
+        Precompile a display list into one callable taking only the
+        scroll offset. Commands are flattened into typed runs of plain
+        tuples at compile time, so the per-frame loop is bound-method
+        calls over baked arguments instead of a Python method dispatch
+        plus attribute reads per command. Runs preserve paint order;
+        unknown command types fall back to their own execute().
+        """
+        steps = []   # (kind, data) runs in paint order
+        run_kind = None
+        run = None
+
+        def start(kind):
+            nonlocal run_kind, run
+            if kind != run_kind:
+                run = []
+                steps.append((kind, run))
+                run_kind = kind
+            return run
+
+        for cmd in display_list:
+            t = type(cmd)
+            if t is DrawRect:
+                start(0).append((cmd.left, cmd.top, cmd.right,
+                                 cmd.bottom, cmd.color))
+            elif t is DrawText:
+                start(1).append((cmd.left, cmd.top, cmd.text,
+                                 cmd.font, cmd.color))
+            elif t is DrawLine:
+                start(2).append((cmd.x1, cmd.y1, cmd.x2, cmd.y2,
+                                 cmd.color, cmd.thickness))
+            elif t is DrawOutline:
+                start(3).append((cmd.x1, cmd.y1, cmd.x2, cmd.y2,
+                                 cmd.color, cmd.thickness))
+            else:
+                start(4).append(cmd)
+
+        create_rect = canvas.create_rectangle
+        create_text = canvas.create_text
+        create_line = canvas.create_line
+
+        def paint(scroll):
+            for kind, data in steps:
+                if kind == 0:
+                    for x1, y1, x2, y2, color in data:
+                        create_rect(x1, y1 - scroll, x2, y2 - scroll,
+                                    width=0, fill=color, tags="page")
+                elif kind == 1:
+                    for x, y, text, font, color in data:
+                        create_text(x, y - scroll, text=text, font=font,
+                                    fill=color, anchor='nw', tags="page")
+                elif kind == 2:
+                    for x1, y1, x2, y2, color, w in data:
+                        create_line(x1, y1 - scroll, x2, y2 - scroll,
+                                    fill=color, width=w, tags="page")
+                elif kind == 3:
+                    for x1, y1, x2, y2, color, w in data:
+                        create_rect(x1, y1 - scroll, x2, y2 - scroll,
+                                    outline=color, width=w, tags="page")
+                else:
+                    for cmd in data:
+                        cmd.execute(scroll, canvas)
+        # Scroll-only frames can canvas.move("page") instead of a full
+        # redraw, but only if every item carries the tag; fallback
+        # commands create untagged items.
+        paint.page_only = not any(kind == 4 for kind, _ in steps)
+        return paint
+
+    def _apply_frame_pil(self, tab, display_list, scroll, canvas) -> None:
+        """
+        Rasterize the frame into one PIL image and blit it with a single
+        canvas item update. Pillow's C core does the fills, so N display
+        commands cost one Tcl round-trip instead of N.
+        """
+        img = getattr(self, "_frame_img", None)
+        if img is None:
+            self._frame_img = img = PILImage.new(
+                "RGB", (WIDTH, HEIGHT), "white")
+            self._frame_draw = PILImageDraw.Draw(img)
+        draw = self._frame_draw
+        draw.rectangle((0, 0, WIDTH, HEIGHT),
+                       fill="black" if self.dark_mode else "white")
+        # Cull to the viewport: the render pass keeps a top-sorted view
+        # of this list, so a bisect selects only visible commands.
+        if getattr(tab, "_dl_src", None) is display_list:
+            tops = tab._dl_tops
+            lo = bisect_left(tops, scroll - tab._dl_maxh)
+            hi = bisect_right(tops, scroll + HEIGHT)
+            display_list = tab._dl_sorted[lo:hi]
+        for cmd in display_list:
+            t = type(cmd)
+            try:
+                if t is DrawRect:
+                    draw.rectangle((cmd.left, cmd.top - scroll,
+                                    cmd.right, cmd.bottom - scroll),
+                                   fill=cmd.color)
+                elif t is DrawText:
+                    draw.text((cmd.left, cmd.top - scroll), cmd.text,
+                              fill=cmd.color, font=_pil_font(cmd.font))
+                elif t is DrawLine:
+                    draw.line((cmd.x1, cmd.y1 - scroll,
+                               cmd.x2, cmd.y2 - scroll),
+                              fill=cmd.color, width=int(cmd.thickness))
+                elif t is DrawOutline:
+                    draw.rectangle((cmd.x1, cmd.y1 - scroll,
+                                    cmd.x2, cmd.y2 - scroll),
+                                   outline=cmd.color,
+                                   width=int(cmd.thickness))
+                elif t is DrawRRect:
+                    r = max(0.0, min(cmd.radius,
+                                     min((cmd.right - cmd.left) / 2,
+                                         (cmd.bottom - cmd.top) / 2)))
+                    draw.rounded_rectangle(
+                        (cmd.left, cmd.top - scroll,
+                         cmd.right, cmd.bottom - scroll),
+                        radius=r, fill=cmd.color)
+                elif t is DrawImage:
+                    x1, y1, x2, y2 = cmd.rect
+                    y1 -= scroll; y2 -= scroll
+                    if isinstance(cmd.image, PILImage.Image):
+                        w = max(1, int(x2 - x1))
+                        h = max(1, int(y2 - y1))
+                        im = cmd.image
+                        if im.size != (w, h):
+                            im = im.resize((w, h))
+                        img.paste(im, (int(x1), int(y1)))
+                    elif cmd.image is not None:
+                        # Undecodable image: same placeholder the
+                        # per-item Tk path draws
+                        draw.rectangle((x1, y1, x2, y2), fill="#ddd")
+                        draw.line((x1, y1, x2, y2), fill="#888", width=1)
+                        draw.line((x2, y1, x1, y2), fill="#888", width=1)
+            except Exception:
+                pass
+        # Scrollbar goes into the same image (mirrors draw_scrollbar)
+        track_left = WIDTH - SCROLLBAR_WIDTH
+        try:
+            draw.rectangle((track_left, 0, WIDTH, HEIGHT), fill="#f0f0f0")
+            if tab.doc_height <= HEIGHT:
+                self.scrollbar_thumb = None
+            else:
+                ratio = HEIGHT / tab.doc_height
+                thumb_h = max(30, int(HEIGHT * ratio))
+                max_scroll = tab.doc_height - HEIGHT
+                thumb_y = int((scroll / max_scroll) * (HEIGHT - thumb_h))
+                self.scrollbar_thumb = (track_left, thumb_y,
+                                        WIDTH, thumb_y + thumb_h)
+                draw.rectangle(self.scrollbar_thumb,
+                               fill="#ccc", outline="#bbb")
+        except Exception:
+            pass
+        # One blit: keep a reference or Tk garbage-collects the photo
+        self._photo = PILImageTk.PhotoImage(img)
+        item = getattr(self, "_bg_item", None)
+        if item is None:
+            canvas.delete("all")
+            self._bg_item = canvas.create_image(
+                0, 0, anchor="nw", image=self._photo)
+        else:
+            canvas.itemconfigure(item, image=self._photo)
+
+    def _apply_frame(self, payload) -> None:
+        """Execute one packaged frame on the Tk thread."""
+        tab, display_list, scroll = payload
+        canvas = getattr(self, "canvas", None)
+        if canvas is None:
+            return
+        if PIL_RASTER:
+            try:
+                self._apply_frame_pil(tab, display_list, scroll, canvas)
+                return
+            except Exception:
+                pass
         try:
             # Set canvas background according to dark mode
             if self.dark_mode:
                 canvas.configure(background="black")
             else:
                 canvas.configure(background="white")
-            canvas.delete("all")
-            for cmd in tab.display_list:
-                cmd.execute(tab.scroll, canvas)
-            self.draw_scrollbar(tab)
+            # Recompile only when the display list itself was rebuilt
+            # (Tab.render replaces the list object); scroll-only frames
+            # reuse the compiled callable.
+            recompiled = getattr(tab, "_compiled_src", None) is not display_list
+            if recompiled:
+                tab._compiled = self._compile_display_list(
+                    display_list, canvas)
+                tab._compiled_src = display_list
+            prev_scroll = getattr(self, "_prev_scroll", None)
+            if (not recompiled and
+                    getattr(self, "_prev_display_list", None) is display_list and
+                    prev_scroll is not None and
+                    getattr(tab._compiled, "page_only", False)):
+                # Content unchanged, only scroll moved: translate the
+                # existing canvas items instead of delete + recreate.
+                dy = prev_scroll - scroll
+                if dy:
+                    canvas.move("page", 0, dy)
+                canvas.delete("scrollbar")
+                self.draw_scrollbar(tab)
+            else:
+                canvas.delete("all")
+                tab._compiled(scroll)
+                self.draw_scrollbar(tab)
+            self._prev_display_list = display_list
+            self._prev_scroll = scroll
         except Exception:
             pass
 
     def draw_scrollbar(self, tab: Tab):
         track_left = WIDTH - SCROLLBAR_WIDTH
-        self.canvas.create_rectangle(track_left, 0, WIDTH, HEIGHT, width=0, fill="#f0f0f0")
+        self.canvas.create_rectangle(track_left, 0, WIDTH, HEIGHT,
+                                     width=0, fill="#f0f0f0",
+                                     tags="scrollbar")
         if tab.doc_height <= HEIGHT:
             self.scrollbar_thumb = None
             return
@@ -4023,7 +5695,9 @@ class Browser:
         max_scroll = tab.doc_height - HEIGHT
         thumb_y = int((tab.scroll / max_scroll) * (HEIGHT - thumb_h))
         self.scrollbar_thumb = (track_left, thumb_y, WIDTH, thumb_y + thumb_h)
-        self.canvas.create_rectangle(*self.scrollbar_thumb, width=1, outline="#bbb", fill="#ccc")
+        self.canvas.create_rectangle(*self.scrollbar_thumb, width=1,
+                                     outline="#bbb", fill="#ccc",
+                                     tags="scrollbar")
 
     # ---- scheduling and rendering utilities ----
     def set_needs_raster_and_draw(self) -> None:
@@ -4045,6 +5719,9 @@ class Browser:
         """
         if not getattr(self, 'needs_raster_and_draw', False):
             return
+        if not getattr(self, '_visible', True):
+            # Keep the dirty flag; the re-map handler repaints
+            return
         try:
             # Delegate to Skia renderer if present
             rnd = getattr(self, 'renderer', None)
@@ -4068,38 +5745,100 @@ class Browser:
         try:
             if tab is getattr(self, 'active_tab', None):
                 self.needs_animation_frame = True
+                # Arm the frame now: without this the flag is only ever
+                # consumed by the scroll path and render tasks starve.
+                self.schedule_animation_frame()
+        except Exception:
+            pass
+
+    def _frame_loop(self) -> None:
+        """
+        Persistent animation-frame scheduler. Waits until a frame is
+        requested, sleeps one refresh interval, then enqueues a render
+        task on the active tab's task runner. Requests arriving while a
+        frame is pending are absorbed by the coalescing token.
+        """
+        while True:
+            self._frame_event.wait()
+            self._frame_event.clear()
+            time.sleep(REFRESH_RATE_SEC)
+            self._run_frame()
+
+    def _run_frame(self) -> None:
+        """One animation-frame tick: scroll inertia, render task, task
+        runner. Runs on the Tk thread in Tk mode (via after) and on the
+        scheduler thread otherwise."""
+        # Skia mode: task execution, rendering, and presenting must all
+        # stay on the SDL mainloop thread — the GL context is current
+        # there, and that loop already polls the task queue and dirty
+        # flags every iteration. Running tasks here too would let two
+        # threads mutate the tree and present concurrently, so the
+        # scheduler thread only resets the coalescing token.
+        if getattr(self, 'renderer', None) is not None:
+            self.animation_timer = None
+            self.needs_animation_frame = False
+            return
+        # Scroll inertia shares the frame cadence instead of running
+        # its own timer chain.
+        scroll_live = False
+        try:
+            if getattr(self, '_scroll_animating', False):
+                scroll_live = self._scroll_step_once()
+        except Exception:
+            pass
+        pending = False
+        try:
+            active_tab = getattr(self, 'active_tab', None)
+            if active_tab and hasattr(active_tab, 'task_runner'):
+                # Only queue a render task when the tab is actually
+                # dirty; unconditionally scheduling one per frame kept
+                # the queue non-empty and the frame chain re-arming
+                # forever.
+                if getattr(active_tab, 'needs_render', False):
+                    task = Task(active_tab.render)
+                    active_tab.task_runner.schedule_task(task)
+                # Task execution lives on the frame path, not in
+                # draw(): run one pending task per frame tick.
+                active_tab.task_runner.run()
+                pending = bool(active_tab.task_runner.tasks)
         except Exception:
             pass
+        # Reset token and flag once the frame task is committed
+        self.animation_timer = None
+        self.needs_animation_frame = False
+        if scroll_live or pending:
+            # Remaining velocity or queued tasks: re-arm the next frame
+            # so the one-task-per-frame pump never strands work.
+            self.needs_animation_frame = True
+            self.schedule_animation_frame()
 
     def schedule_animation_frame(self) -> None:
         """
         Schedule a task to render the active tab on the next animation
-        frame. This sets up a timer that will execute after
-        REFRESH_RATE_SEC seconds and enqueues a render task on the
-        active tab's task runner. If an animation frame is already
-        scheduled or no frame is needed, this returns immediately.
+        frame. If an animation frame is already pending or no frame is
+        needed, this returns immediately; otherwise it wakes the
+        persistent scheduler thread (no per-frame thread creation).
         """
         try:
             if not getattr(self, 'needs_animation_frame', False):
                 return
-            if getattr(self, 'animation_timer', None) is not None:
+            # Hidden windows get no frames; the chain restarts on re-map
+            if not getattr(self, '_visible', True):
                 return
-
-            def callback():
-                # After the delay, enqueue a render task on the active tab
-                try:
-                    active_tab = getattr(self, 'active_tab', None)
-                    if active_tab and hasattr(active_tab, 'task_runner'):
-                        task = Task(active_tab.render)
-                        active_tab.task_runner.schedule_task(task)
-                except Exception:
-                    pass
-                # Reset timer and flag
-                self.animation_timer = None
-                self.needs_animation_frame = False
-            # Start a new timer for the next animation frame
-            self.animation_timer = threading.Timer(REFRESH_RATE_SEC, callback)
-            self.animation_timer.start()
+            if getattr(self, 'animation_timer', None):
+                return
+            # Tk mode: reuse Tk's own timer wheel so the callback runs
+            # on the UI thread — no extra thread handoff and widget
+            # access from the frame tick is safe. Skia mode keeps the
+            # scheduler thread (its renderer owns the event loop).
+            window = getattr(self, 'window', None)
+            if getattr(self, 'renderer', None) is None and \
+                    window is not None and hasattr(window, 'after'):
+                self.animation_timer = window.after(
+                    int(REFRESH_RATE_SEC * 1000), self._run_frame)
+            else:
+                self.animation_timer = True
+                self._frame_event.set()
         except Exception:
             pass
 